@@ -7,8 +7,12 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from ShrutixMusic import LOGGER, nand, userbot
 from ShrutixMusic.core.call import Shruti
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.core.workers import download_pool, worker_pool
 from ShrutixMusic.misc import sudo
 from ShrutixMusic.plugins import ALL_MODULES
+from ShrutixMusic.utils.endpoints import api_endpoints
+from ShrutixMusic.utils.mediacache import media_cache
 from ShrutixMusic.utils.database import get_banned_users, get_gbanned
 from config import BANNED_USERS
 
@@ -23,6 +27,8 @@ async def init():
     ):
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
+    worker_pool.start()
+    download_pool.start()
     await sudo()
     try:
         users = await get_gbanned()
@@ -33,6 +39,9 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
+    await http_client.start()
+    await api_endpoints.start()
+    await media_cache.start()
     await nand.start()
     for all_module in ALL_MODULES:
         importlib.import_module("ShrutixMusic.plugins" + all_module)
@@ -55,6 +64,10 @@ async def init():
     await idle()
     await nand.stop()
     await userbot.stop()
+    await http_client.close()
+    media_cache.flush()
+    worker_pool.close()
+    download_pool.close()
     LOGGER("ShrutixMusic").info("Stopping ShrutixMusic Music Bot...")
 
 
@@ -1,5 +1,4 @@
 import asyncio
-import os
 from datetime import datetime, timedelta
 from typing import Union
 
@@ -32,18 +31,37 @@ from ShrutixMusic.utils.database import (
     set_loop,
 )
 from ShrutixMusic.utils.exceptions import AssistantErr
-from ShrutixMusic.utils.formatters import check_duration, seconds_to_min, speed_converter
+from ShrutixMusic.utils.formatters import speed_converter
 from ShrutixMusic.utils.inline.play import stream_markup
 from ShrutixMusic.utils.stream.autoclear import auto_clean
-from ShrutixMusic.utils.thumbnails import get_thumb
+from ShrutixMusic.utils.stream.prefetch import prefetcher
+from ShrutixMusic.utils.thumbnails import get_thumb, send_card
 from strings import get_string
 
 autoend = {}
 counter = {}
 
 
+def ffmpeg_parameters(to_seek, duration, speed=1.0):
+    """
+    Input options that start the file at to_seek, off normal speed the
+    audio and video are also retimed on the fly. py-tgcalls appends its own
+    -vf scale to the video command, which would replace a setpts filter,
+    so video timestamps are scaled on the input with -itsscale instead.
+    """
+    parameters = f"-ss {to_seek} -to {duration}"
+    if float(speed) == 1.0:
+        return parameters
+    # -to would be read in the scaled time, the video simply runs to its end
+    return (
+        f"--audio {parameters} -atmid -filter:a atempo={speed} "
+        f"--video -itsscale {1 / float(speed):.6f} -ss {to_seek}"
+    )
+
+
 async def _clear_(chat_id):
     db[chat_id] = []
+    prefetcher.cancel(chat_id)
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
 
@@ -150,56 +168,25 @@ class Call(PyTgCalls):
 
     async def speedup_stream(self, chat_id: int, file_path, speed, playing):
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != str("1.0"):
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == str("0.5"):
-                    vs = 2.0
-                if str(speed) == str("0.75"):
-                    vs = 1.35
-                if str(speed) == str("1.5"):
-                    vs = 0.68
-                if str(speed) == str("2.0"):
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await proc.communicate()
-            else:
-                pass
-        else:
-            out = file_path
-        dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
+        # db counts in played time, the file is read in its own time
+        current = float(playing[0].get("speed") or 1.0)
+        seconds = int(playing[0].get("old_second") or playing[0]["seconds"])
+        position = int(playing[0]["played"] * current)
+        duration, con_seconds = speed_converter(seconds, speed)
+        played, con_played = speed_converter(position, speed)
+        parameters = ffmpeg_parameters(position, seconds, speed)
         stream = (
             AudioVideoPiped(
-                out,
+                file_path,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
             if playing[0]["streamtype"] == "video"
             else AudioPiped(
-                out,
+                file_path,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {played} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
         )
         if str(db[chat_id][0]["file"]) == str(file_path):
@@ -211,10 +198,9 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
+            db[chat_id][0]["played"] = con_played
             db[chat_id][0]["dur"] = duration
-            db[chat_id][0]["seconds"] = dur
-            db[chat_id][0]["speed_path"] = out
+            db[chat_id][0]["seconds"] = con_seconds
             db[chat_id][0]["speed"] = speed
 
     async def force_stop_stream(self, chat_id: int):
@@ -252,20 +238,21 @@ class Call(PyTgCalls):
             stream,
         )
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=1.0):
         assistant = await group_assistant(self, chat_id)
+        parameters = ffmpeg_parameters(to_seek, duration, speed)
         stream = (
             AudioVideoPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
                 video_parameters=MediumQualityVideo(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
             if mode == "video"
             else AudioPiped(
                 file_path,
                 audio_parameters=HighQualityAudio(),
-                additional_ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                additional_ffmpeg_parameters=parameters,
             )
         )
         await assistant.change_stream(chat_id, stream)
@@ -350,6 +337,7 @@ class Call(PyTgCalls):
             except:
                 return
         else:
+            prefetcher.schedule(chat_id)
             queued = check[0]["file"]
             language = await get_lang(chat_id)
             _ = get_string(language)
@@ -363,7 +351,6 @@ class Call(PyTgCalls):
             if exis:
                 db[chat_id][0]["dur"] = exis
                 db[chat_id][0]["seconds"] = check[0]["old_second"]
-                db[chat_id][0]["speed_path"] = None
                 db[chat_id][0]["speed"] = 1.0
             video = True if str(streamtype) == "video" else False
             if "live_" in queued:
@@ -393,9 +380,11 @@ class Call(PyTgCalls):
                     )
                 img = await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
-                run = await nand.send_photo(
+                run = await send_card(
+                    videoid,
+                    img,
+                    nand.send_photo,
                     chat_id=original_chat_id,
-                    photo=img,
                     caption=_["stream_1"].format(
                         f"https://t.me/{nand.username}?start=info_{videoid}",
                         title[:23],
@@ -440,9 +429,11 @@ class Call(PyTgCalls):
                 img = await get_thumb(videoid)
                 button = stream_markup(_, chat_id)
                 await mystic.delete()
-                run = await nand.send_photo(
+                run = await send_card(
+                    videoid,
+                    img,
+                    nand.send_photo,
                     chat_id=original_chat_id,
-                    photo=img,
                     caption=_["stream_1"].format(
                         f"https://t.me/{nand.username}?start=info_{videoid}",
                         title[:23],
@@ -527,9 +518,11 @@ class Call(PyTgCalls):
                 else:
                     img = await get_thumb(videoid)
                     button = stream_markup(_, chat_id)
-                    run = await nand.send_photo(
+                    run = await send_card(
+                        videoid,
+                        img,
+                        nand.send_photo,
                         chat_id=original_chat_id,
-                        photo=img,
                         caption=_["stream_1"].format(
                             f"https://t.me/{nand.username}?start=info_{videoid}",
                             title[:23],
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 from ..logging import LOGGER
 
@@ -16,5 +17,7 @@ def dirr():
         os.mkdir("downloads")
     if "cache" not in os.listdir():
         os.mkdir("cache")
+    # Left over from when speed changes were re-encoded to disk
+    shutil.rmtree("playback", ignore_errors=True)
 
     LOGGER(__name__).info("Directories Updated.")
@@ -0,0 +1,85 @@
+import aiohttp
+
+import config
+
+from ..logging import LOGGER
+
+
+class HttpClient:
+    """
+    One pooled aiohttp session shared by every platform and utility module,
+    so connections, TLS sessions and DNS answers are reused between calls.
+    """
+
+    def __init__(self):
+        self._session = None
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_request_start.append(self._on_request_start)
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            trace.on_dns_cache_hit.append(self._on_dns_hit)
+            trace.on_dns_cache_miss.append(self._on_dns_miss)
+            connector = aiohttp.TCPConnector(
+                limit=config.HTTP_POOL_LIMIT,
+                limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=config.HTTP_KEEPALIVE,
+                ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=config.HTTP_TIMEOUT,
+                    sock_connect=config.HTTP_CONNECT_TIMEOUT,
+                ),
+                trace_configs=[trace],
+            )
+        return self._session
+
+    async def start(self):
+        self.session
+        LOGGER(__name__).info("HTTP Session Pool Started.")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _on_request_start(self, session, context, params):
+        self.requests += 1
+
+    async def _on_connection_create(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuse(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _on_dns_hit(self, session, context, params):
+        self.dns_hits += 1
+
+    async def _on_dns_miss(self, session, context, params):
+        self.dns_misses += 1
+
+    def stats(self) -> dict:
+        connections = self.connections_created + self.connections_reused
+        return {
+            "requests": self.requests,
+            "created": self.connections_created,
+            "reused": self.connections_reused,
+            "reuse_rate": round(self.connections_reused * 100 / connections, 2)
+            if connections
+            else 0,
+            "dns_hits": self.dns_hits,
+            "dns_misses": self.dns_misses,
+        }
+
+
+http_client = HttpClient()
@@ -0,0 +1,67 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import config
+
+from ..logging import LOGGER
+
+
+class WorkerPool:
+    """
+    Process pool for blocking or CPU heavy work such as yt-dlp extraction,
+    so it never runs on the event loop. Workers are forked at startup,
+    before the clients open their connections and threads.
+    """
+
+    def __init__(self, size: int, name: str = "worker"):
+        self.size = size
+        self.name = name
+        self._executor = None
+        self.submitted = 0
+        self.running = 0
+        self.failed = 0
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.size,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+            # Submitting a no-op makes the pool fork its workers right away
+            self._executor.submit(int).result()
+            LOGGER(__name__).info(f"Started {self.size} {self.name} processes")
+
+    async def run(self, func, *args):
+        """Runs func(*args) in a worker process and returns its result."""
+        self.start()
+        self.submitted += 1
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "submitted": self.submitted,
+            "running": self.running,
+            "failed": self.failed,
+        }
+
+
+# Short jobs like thumbnails and metadata lookups, long downloads get their
+# own pool so they never hold every worker
+worker_pool = WorkerPool(config.WORKER_PROCESSES)
+download_pool = WorkerPool(config.DOWNLOAD_PROCESSES, "download")
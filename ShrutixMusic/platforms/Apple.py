@@ -1,15 +1,23 @@
+import asyncio
 import re
 from typing import Union
 
-import aiohttp
 from bs4 import BeautifulSoup
-from py_yt import VideosSearch
+
+import config
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.trackmatch import track_matches
+from ShrutixMusic.utils.ttlcache import TTLCache, cached_call
 
 
 class AppleAPI:
     def __init__(self):
         self.regex = r"^(https:\/\/music.apple.com\/)(.*)$"
         self.base = "https://music.apple.com/in/playlist/"
+        self.cache = TTLCache(500, config.SCRAPE_CACHE_TTL)
+        self.flights = SingleFlight()
+        self.limit = asyncio.Semaphore(config.SCRAPE_CONCURRENCY)
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -17,46 +25,26 @@ class AppleAPI:
         else:
             return False
 
-    async def track(self, url, playid: Union[bool, str] = None):
-        if playid:
-            url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
+    async def _page(self, url, parse):
+        """Downloads url and runs parse(html) on a thread, a few pages at a time."""
+        async with self.limit:
+            async with http_client.session.get(url) as response:
                 if response.status != 200:
                     return False
                 html = await response.text()
+            return await asyncio.get_running_loop().run_in_executor(None, parse, html)
+
+    @staticmethod
+    def _parse_track(html):
         soup = BeautifulSoup(html, "html.parser")
         search = None
         for tag in soup.find_all("meta"):
             if tag.get("property", None) == "og:title":
                 search = tag.get("content", None)
-        if search is None:
-            return False
-        results = VideosSearch(search, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        return search
 
-    async def playlist(self, url, playid: Union[bool, str] = None):
-        if playid:
-            url = self.base + url
-        playlist_id = url.split("playlist/")[1]
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
+    @staticmethod
+    def _parse_playlist(html):
         soup = BeautifulSoup(html, "html.parser")
         applelinks = soup.find_all("meta", attrs={"property": "music:song"})
         results = []
@@ -68,4 +56,30 @@ class AppleAPI:
             except:
                 xx = ((item["content"]).split("album/")[1]).split("/")[0]
             results.append(xx)
+        return results
+
+    async def track(self, url, playid: Union[bool, str] = None):
+        if playid:
+            url = self.base + url
+        return await cached_call(self.cache, self.flights, ("track", url), self._track, url)
+
+    async def _track(self, url):
+        search = await self._page(url, self._parse_track)
+        if not search:
+            return False
+        # Album links name the song with ?i=, so the whole url identifies the track
+        return await track_matches.track(search, "apple", url)
+
+    async def playlist(self, url, playid: Union[bool, str] = None):
+        if playid:
+            url = self.base + url
+        return await cached_call(
+            self.cache, self.flights, ("playlist", url), self._playlist, url
+        )
+
+    async def _playlist(self, url):
+        playlist_id = url.split("playlist/")[1]
+        results = await self._page(url, self._parse_playlist)
+        if results is False:
+            return False
         return results, playlist_id
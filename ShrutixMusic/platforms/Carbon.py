@@ -1,12 +1,12 @@
-import random
-from os.path import realpath
+import hashlib
+import os
+import textwrap
 
-import aiohttp
-from aiohttp import client_exceptions
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
-
-class UnableToFetchCarbon(Exception):
-    pass
+import config
+from ShrutixMusic.core.workers import worker_pool
+from ShrutixMusic.utils.singleflight import SingleFlight
 
 
 themes = [
@@ -67,40 +67,178 @@ colour = [
 ]
 
 
+# Window background and text colour drawn for each theme
+palettes = {
+    "3024-night": ("#090300", "#d6d5d4"),
+    "a11y-dark": ("#2b2b2b", "#f8f8f2"),
+    "blackboard": ("#0c1021", "#f8f8f8"),
+    "base16-dark": ("#151515", "#e0e0e0"),
+    "base16-light": ("#f5f5f5", "#202020"),
+    "cobalt": ("#002240", "#ffffff"),
+    "duotone-dark": ("#2a2734", "#eeebff"),
+    "dracula-pro": ("#22212c", "#f8f8f2"),
+    "hopscotch": ("#322931", "#d5d3d5"),
+    "lucario": ("#2b3e50", "#f8f8f2"),
+    "material": ("#263238", "#eeffff"),
+    "monokai": ("#272822", "#f8f8f2"),
+    "nightowl": ("#011627", "#d6deeb"),
+    "nord": ("#2e3440", "#d8dee9"),
+    "oceanic-next": ("#1b2b34", "#cdd3de"),
+    "one-light": ("#fafafa", "#383a42"),
+    "one-dark": ("#282c34", "#abb2bf"),
+    "panda-syntax": ("#292a2b", "#e6e6e6"),
+    "parasio-dark": ("#2f1e2e", "#a39e9b"),
+    "seti": ("#151718", "#cfd2d1"),
+    "shades-of-purple": ("#2d2b55", "#ffffff"),
+    "solarized+dark": ("#002b36", "#839496"),
+    "solarized+light": ("#fdf6e3", "#657b83"),
+    "synthwave-84": ("#262335", "#ffffff"),
+    "twilight": ("#141414", "#f7f7f7"),
+    "verminal": ("#191919", "#ffffff"),
+    "vscode": ("#1e1e1e", "#d4d4d4"),
+    "yeti": ("#eceae8", "#d1c9c0"),
+    "zenburn": ("#3f3f3f", "#dcdccc"),
+}
+# Window buttons, left to right
+buttons = ["#ff5f56", "#ffbd2e", "#27c93f"]
+
+# Used in order for characters font2.ttf has no glyph for, like the small caps
+# of the strings and Hindi, Arabic or Punjabi text. The Dockerfile installs them.
+FALLBACK_FONTS = [
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansGurmukhi-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansBengali-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansTamil-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+# A private use character no font draws, so its mask is the missing glyph box
+MISSING = "\U0010fffd"
+
+# Fonts and the font picked for each character, per worker process
+FONTS = {}
+GLYPHS = {}
+
+
+def get_fonts(size=28):
+    fonts = FONTS.get(size)
+    if fonts is None:
+        fonts = [ImageFont.truetype("ShrutixMusic/assets/font2.ttf", size)]
+        for path in FALLBACK_FONTS:
+            if os.path.isfile(path):
+                fonts.append(ImageFont.truetype(path, size))
+        FONTS[size] = fonts
+    return fonts
+
+
+def pick_font(fonts, char):
+    """The first font with a glyph for char, else the main one."""
+    key = (id(fonts), char)
+    if key not in GLYPHS:
+        GLYPHS[key] = fonts[0]
+        if not char.isspace():
+            for font in fonts:
+                if bytes(font.getmask(char)) != bytes(font.getmask(MISSING)):
+                    GLYPHS[key] = font
+                    break
+    return GLYPHS[key]
+
+
+def runs(fonts, line):
+    """Splits line into (text, font) pieces, spaces stay with the text before them."""
+    pieces = []
+    for char in line:
+        font = pick_font(fonts, char)
+        if pieces and (char.isspace() or pieces[-1][1] is font):
+            pieces[-1][0] += char
+        else:
+            pieces.append([char, font])
+    return pieces
+
+
+def line_length(fonts, line):
+    return sum(font.getlength(text) for text, font in runs(fonts, line))
+
+
+def render_carbon(text, path, theme, background):
+    """Draws the code card for text, runs in a worker process."""
+    window, foreground = palettes[theme]
+    fonts = get_fonts()
+    lines = []
+    for line in text.expandtabs(4).splitlines() or [""]:
+        lines.extend(textwrap.wrap(line, 80) or [""])
+    height = fonts[0].getbbox("Ag")[3] + 10
+    width = max(int(line_length(fonts, line)) for line in lines)
+    box = (80, 80, 80 + max(width, 400) + 64, 80 + 72 + height * len(lines) + 32)
+    image = Image.new("RGB", (box[2] + 80, box[3] + 80), background)
+    shadow = Image.new("L", image.size, 0)
+    ImageDraw.Draw(shadow).rounded_rectangle(
+        (box[0], box[1] + 20, box[2], box[3] + 20), 12, fill=140
+    )
+    image.paste((0, 0, 0), mask=shadow.filter(ImageFilter.GaussianBlur(34)))
+    draw = ImageDraw.Draw(image)
+    draw.rounded_rectangle(box, 12, fill=window)
+    for number, colour in enumerate(buttons):
+        left = box[0] + 32 + number * 30
+        draw.ellipse((left, box[1] + 28, left + 18, box[1] + 46), fill=colour)
+    for number, line in enumerate(lines):
+        left = box[0] + 32
+        for text, font in runs(fonts, line):
+            draw.text((left, box[1] + 72 + number * height), text, foreground, font=font)
+            left += font.getlength(text)
+    # Written aside first so generate never picks up a half written card
+    image.save(f"{path}.tmp", format="JPEG", quality=90, optimize=True)
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
 class CarbonAPI:
+    """
+    Renders text into a carbon style card locally. Cards are named after a
+    hash of their text, so the same text is drawn once and then reused, and
+    only the last CARBON_CACHE_SIZE cards are kept in cache/carbon.
+    """
+
     def __init__(self):
-        self.language = "auto"
-        self.drop_shadow = True
-        self.drop_shadow_blur = "68px"
-        self.drop_shadow_offset = "20px"
-        self.font_family = "JetBrains Mono"
-        self.width_adjustment = True
-        self.watermark = False
-
-    async def generate(self, text: str, user_id):
-        async with aiohttp.ClientSession(
-            headers={"Content-Type": "application/json"},
-        ) as ses:
-            params = {
-                "code": text,
-            }
-            params["backgroundColor"] = random.choice(colour)
-            params["theme"] = random.choice(themes)
-            params["dropShadow"] = self.drop_shadow
-            params["dropShadowOffsetY"] = self.drop_shadow_offset
-            params["dropShadowBlurRadius"] = self.drop_shadow_blur
-            params["fontFamily"] = self.font_family
-            params["language"] = self.language
-            params["watermark"] = self.watermark
-            params["widthAdjustment"] = self.width_adjustment
+        self.directory = os.path.join("cache", "carbon")
+        self.limit = config.CARBON_CACHE_SIZE
+        self.renders = SingleFlight()
+
+    async def generate(self, text: str):
+        digest = hashlib.sha1(text.encode()).hexdigest()
+        path = os.path.realpath(os.path.join(self.directory, f"{digest}.jpg"))
+        if os.path.isfile(path):
+            os.utime(path)
+            return path
+        return await self.renders.do(digest, self._render, text, digest, path)
+
+    async def _render(self, text, digest, path):
+        os.makedirs(self.directory, exist_ok=True)
+        # Theme and colour follow from the hash so a cached card never changes look
+        seed = int(digest, 16)
+        await worker_pool.run(
+            render_carbon,
+            text,
+            path,
+            themes[seed % len(themes)],
+            colour[(seed // len(themes)) % len(colour)],
+        )
+        self._prune()
+        return path
+
+    def _prune(self):
+        try:
+            cards = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".jpg")
+            ]
+        except OSError:
+            return
+        cards.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in cards[self.limit :]:
             try:
-                request = await ses.post(
-                    "https://carbonara.solopov.dev/api/cook",
-                    json=params,
-                )
-            except client_exceptions.ClientConnectorError:
-                raise UnableToFetchCarbon("Can not reach the Host!")
-            resp = await request.read()
-            with open(f"cache/carbon{user_id}.jpg", "wb") as f:
-                f.write(resp)
-            return realpath(f.name)
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -1,15 +1,23 @@
+import asyncio
 import re
 from typing import Union
 
-import aiohttp
 from bs4 import BeautifulSoup
-from py_yt import VideosSearch
+
+import config
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.trackmatch import track_matches
+from ShrutixMusic.utils.ttlcache import TTLCache, cached_call
 
 
 class RessoAPI:
     def __init__(self):
         self.regex = r"^(https:\/\/m.resso.com\/)(.*)$"
         self.base = "https://m.resso.com/"
+        self.cache = TTLCache(500, config.SCRAPE_CACHE_TTL)
+        self.flights = SingleFlight()
+        self.limit = asyncio.Semaphore(config.SCRAPE_CONCURRENCY)
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -17,15 +25,11 @@ class RessoAPI:
         else:
             return False
 
-    async def track(self, url, playid: Union[bool, str] = None):
-        if playid:
-            url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
+    @staticmethod
+    def _parse_track(html):
         soup = BeautifulSoup(html, "html.parser")
+        title = None
+        des = None
         for tag in soup.find_all("meta"):
             if tag.get("property", None) == "og:title":
                 title = tag.get("content", None)
@@ -35,20 +39,22 @@ class RessoAPI:
                     des = des.split("·")[0]
                 except:
                     pass
+        return title, des
+
+    async def track(self, url, playid: Union[bool, str] = None):
+        if playid:
+            url = self.base + url
+        return await cached_call(self.cache, self.flights, url, self._track, url)
+
+    async def _track(self, url):
+        async with self.limit:
+            async with http_client.session.get(url) as response:
+                if response.status != 200:
+                    return False
+                html = await response.text()
+            title, des = await asyncio.get_running_loop().run_in_executor(
+                None, self._parse_track, html
+            )
         if des == "":
             return
-        results = VideosSearch(title, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            ytlink = result["link"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        return await track_matches.track(title, "resso", url.split("?")[0].rstrip("/"))
@@ -1,8 +1,15 @@
+import asyncio
+import os
+import time
 from os import path
 
-from yt_dlp import YoutubeDL
-
-from ShrutixMusic.utils.formatters import seconds_to_min
+import config
+from ShrutixMusic import nand
+from ShrutixMusic.core.workers import download_pool, worker_pool
+from ShrutixMusic.utils import ytdlp
+from ShrutixMusic.utils.formatters import convert_bytes, get_readable_time, seconds_to_min
+from ShrutixMusic.utils.mediacache import media_cache
+from ShrutixMusic.utils.singleflight import SingleFlight
 
 
 class SoundAPI:
@@ -14,6 +21,7 @@ class SoundAPI:
             "nooverwrites": False,
             "continuedl": True,
         }
+        self.downloads = SingleFlight()
 
     async def valid(self, link: str):
         if "soundcloud" in link:
@@ -21,10 +29,9 @@ class SoundAPI:
         else:
             return False
 
-    async def download(self, url):
-        d = YoutubeDL(self.opts)
+    async def download(self, url, mystic=None, _=None):
         try:
-            info = d.extract_info(url)
+            info = await worker_pool.run(ytdlp.extract, url, self.opts)
         except:
             return False
         xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
@@ -36,4 +43,59 @@ class SoundAPI:
             "uploader": info["uploader"],
             "filepath": xyz,
         }
+        if info["duration"] > config.DURATION_LIMIT:
+            # Rejected by the caller anyway, so skip the download
+            return track_details, xyz
+        if not media_cache.get(xyz):
+            if not await self.downloads.do(xyz, self._fetch, url, xyz, info, mystic, _):
+                return False
         return track_details, xyz
+
+    async def _fetch(self, url, xyz, info, mystic, _):
+        task = asyncio.ensure_future(download_pool.run(ytdlp.fetch, url, self.opts))
+        if mystic and _:
+            await self._progress(task, xyz, info["filesize"], mystic, _)
+        try:
+            await task
+        except:
+            return False
+        if not path.isfile(xyz):
+            return False
+        media_cache.put(xyz)
+        return True
+
+    async def _progress(self, task, xyz, total, mystic, _):
+        """Edits mystic every few seconds with how far the worker got, judged by the file size."""
+        start = time.time()
+        while True:
+            await asyncio.wait([task], timeout=5)
+            if task.done():
+                return
+            current = 0
+            for name in (f"{xyz}.part", xyz):
+                try:
+                    current = os.path.getsize(name)
+                    break
+                except OSError:
+                    continue
+            if not current:
+                continue
+            speed = current / (time.time() - start)
+            if total and total > current:
+                percentage = round(current * 100 / total, 2)
+                eta = get_readable_time(int((total - current) / speed)) or "0 sᴇᴄᴏɴᴅs"
+            else:
+                percentage, eta = "-", "-"
+            try:
+                await mystic.edit_text(
+                    _["tg_1"].format(
+                        nand.mention,
+                        convert_bytes(total) or "-",
+                        convert_bytes(current),
+                        percentage,
+                        convert_bytes(speed),
+                        eta,
+                    )
+                )
+            except:
+                pass
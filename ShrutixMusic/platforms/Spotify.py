@@ -1,14 +1,19 @@
+import asyncio
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
-from py_yt import VideosSearch
 import config
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.trackmatch import track_matches
+from ShrutixMusic.utils.ttlcache import TTLCache, cached_call
 
 
 class SpotifyAPI:
     def __init__(self):
         self.regex = r"^(https:\/\/open.spotify.com\/)(.*)$"
+        self.id_regex = re.compile(r"(?:track|playlist|album|artist)[/:]([A-Za-z0-9]+)")
         self.client_id = config.SPOTIFY_CLIENT_ID
         self.client_secret = config.SPOTIFY_CLIENT_SECRET
         if config.SPOTIFY_CLIENT_ID and config.SPOTIFY_CLIENT_SECRET:
@@ -20,6 +25,10 @@ class SpotifyAPI:
             )
         else:
             self.spotify = None
+        # spotipy is blocking, its calls run on these threads instead of the event loop
+        self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="spotify")
+        self.cache = TTLCache(500, config.SPOTIFY_CACHE_TTL)
+        self.lookups = SingleFlight()
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -27,54 +36,63 @@ class SpotifyAPI:
         else:
             return False
 
-    async def track(self, link: str):
-        track = self.spotify.track(link)
-        info = track["name"]
-        for artist in track["artists"]:
+    async def _cached(self, kind: str, link: str, func, *args):
+        """Awaits func(*args) once per Spotify id of link and caches the result."""
+        match = self.id_regex.search(link)
+        key = (kind, match.group(1) if match else link)
+        return await cached_call(self.cache, self.lookups, key, func, *args)
+
+    async def _run(self, func, *args):
+        """Runs a blocking spotipy call on the Spotify threads."""
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    def _paged(self, page: dict) -> list:
+        """Items of a paging object, following next pages up to PLAYLIST_FETCH_LIMIT."""
+        items = []
+        while page:
+            items.extend(page["items"])
+            if len(items) >= config.PLAYLIST_FETCH_LIMIT or not page.get("next"):
+                break
+            page = self.spotify.next(page)
+        return items[: config.PLAYLIST_FETCH_LIMIT]
+
+    @staticmethod
+    def _query(item: dict) -> str:
+        info = item["name"]
+        for artist in item["artists"]:
             fetched = f' {artist["name"]}'
             if "Various Artists" not in fetched:
                 info += fetched
-        results = VideosSearch(info, limit=1)
-        for result in (await results.next())["result"]:
-            ytlink = result["link"]
-            title = result["title"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        return info
+
+    async def track(self, link: str):
+        return await self._cached("track", link, self._track, link)
+
+    async def _track(self, link: str):
+        track = await self._run(self.spotify.track, link)
+        return await track_matches.track(self._query(track), "spotify", track["id"])
 
     async def playlist(self, url):
+        return await self._cached("playlist", url, self._run, self._playlist, url)
+
+    def _playlist(self, url):
         playlist = self.spotify.playlist(url)
         playlist_id = playlist["id"]
         results = []
-        for item in playlist["tracks"]["items"]:
+        for item in self._paged(playlist["tracks"]):
             music_track = item["track"]
-            info = music_track["name"]
-            for artist in music_track["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+            if not music_track:
+                continue
+            results.append(self._query(music_track))
         return results, playlist_id
 
     async def album(self, url):
+        return await self._cached("album", url, self._run, self._album, url)
+
+    def _album(self, url):
         album = self.spotify.album(url)
         album_id = album["id"]
-        results = []
-        for item in album["tracks"]["items"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        results = [self._query(item) for item in self._paged(album["tracks"])]
 
         return (
             results,
@@ -82,16 +100,12 @@ class SpotifyAPI:
         )
 
     async def artist(self, url):
+        return await self._cached("artist", url, self._run, self._artist, url)
+
+    def _artist(self, url):
         artistinfo = self.spotify.artist(url)
         artist_id = artistinfo["id"]
-        results = []
         artisttoptracks = self.spotify.artist_top_tracks(url)
-        for item in artisttoptracks["tracks"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        results = [self._query(item) for item in artisttoptracks["tracks"]]
 
         return results, artist_id
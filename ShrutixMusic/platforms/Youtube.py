@@ -1,23 +1,44 @@
 import asyncio
+import glob
+from abc import ABC, abstractmethod
 import os
 import re
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 import requests
-import yt_dlp
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
-from py_yt import VideosSearch
-from ShrutixMusic.utils.database import is_on_off
+from ShrutixMusic.utils.database import (
+    delete_tg_file,
+    get_tg_file,
+    is_on_off,
+    save_tg_file,
+)
+from ShrutixMusic.utils.downloader import download_file
+from ShrutixMusic.utils.endpoints import api_endpoints
 from ShrutixMusic import nand
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.core.workers import download_pool, worker_pool
 from ShrutixMusic.utils.formatters import time_to_seconds
+from ShrutixMusic.utils.mediacache import media_cache
+from ShrutixMusic.utils import ytdlp
+from ShrutixMusic.utils.resilience import CircuitBreaker, backoff, hedged
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.trackinfo import track_info
 import random
 import logging
 import aiohttp
+import config
 from ShrutixMusic import LOGGER
 from urllib.parse import urlparse
 
-YOUR_API_URL = None
+downloads = SingleFlight()
+fills = SingleFlight()
+stream_urls = {}
+tg_index_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+# Threads listing playlists for playlist_stream, each keeps a warm YoutubeDL
+listers = ThreadPoolExecutor(max_workers=2, thread_name_prefix="playlist")
 
 def cookie_txt_file():
     folder_path = f"{os.getcwd()}/cookies"
@@ -30,32 +51,62 @@ def cookie_txt_file():
         file.write(f'Choosen File : {cookie_txt_file}\n')
     return f"""cookies/{str(cookie_txt_file).split("/")[-1]}"""
 
-async def load_api_url():
-    global YOUR_API_URL
+async def request_download(video_id: str, media_type: str) -> dict:
+    """
+    Asks the download API for a track. A slow endpoint gets a duplicate call
+    to the next one after its p95 latency, failing endpoints are skipped by
+    their circuit breaker and a failed round is retried with jittered backoff.
+    """
     logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
-    
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://pastebin.com/raw/rLsBhAQa") as response:
-                if response.status == 200:
-                    content = await response.text()
-                    YOUR_API_URL = content.strip()
-                    logger.info(f"API URL loaded successfully")
-                else:
-                    logger.error(f"Failed to fetch API URL. HTTP Status: {response.status}")
-    except Exception as e:
-        logger.error(f"Error loading API URL: {e}")
-
-try:
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        asyncio.create_task(load_api_url())
-    else:
-        loop.run_until_complete(load_api_url())
-except RuntimeError:
-    pass
-
-async def get_telegram_file(telegram_link: str, video_id: str, file_type: str) -> str:
+    params = {"url": video_id, "type": media_type}
+    loop = asyncio.get_running_loop()
+
+    async def ask(base):
+        if not api_endpoints.claim(base):
+            return False, None
+        start = loop.time()
+        try:
+            async with http_client.session.get(
+                f"{base}/download",
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=config.API_TIMEOUT)
+            ) as response:
+                status = response.status
+                data = await response.json() if status == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.warning(f"API endpoint failed: {base} - {e}")
+            api_endpoints.record(base, False)
+            return False, None
+        except asyncio.CancelledError:
+            # A faster endpoint answered first, this one learned nothing
+            api_endpoints.release(base)
+            raise
+        if status == 429 or status >= 500:
+            logger.warning(f"API endpoint error {status}: {base}")
+            api_endpoints.record(base, False)
+            return False, None
+        api_endpoints.record(base, True, loop.time() - start)
+        if status != 200:
+            logger.error(f"API error: {status}")
+        return True, data
+
+    for attempt in range(config.API_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(backoff(attempt))
+        endpoints = api_endpoints.candidates()
+        if not endpoints:
+            await api_endpoints.refresh()
+            endpoints = api_endpoints.candidates()
+        if not endpoints:
+            continue
+        ok, data = await hedged(endpoints, ask, api_endpoints.hedge_delay)
+        if ok:
+            return data
+    logger.error("API URL not available")
+    return None
+
+
+async def get_telegram_file(telegram_link: str, video_id: str, file_type: str, file_id: str = None) -> str:
     """
     TG link to source
     """
@@ -69,24 +120,37 @@ async def get_telegram_file(telegram_link: str, video_id: str, file_type: str) -
             logger.info(f"📂 [LOCAL] File exists: {video_id}")
             return file_path
         
-        # Parse Telegram link: https://t.me/channelname/messageid
-        parsed = urlparse(telegram_link)
-        parts = parsed.path.strip("/").split("/")
-        
-        if len(parts) < 2:
-            logger.error(f"❌ Invalid Telegram link format: {telegram_link}")
-            return None
-            
-        channel_name = parts[0]
-        message_id = int(parts[1])
-        
-        logger.info(f"📥 [TELEGRAM] Downloading from @{channel_name}/{message_id}")
-        
-        # Pyrogram se message fetch karke download
-        msg = await nand.get_messages(channel_name, message_id)
-        
         os.makedirs("downloads", exist_ok=True)
-        await msg.download(file_name=file_path)
+
+        # Indexed file_id se seedha download, message fetch ki zarurat nahi
+        if file_id:
+            try:
+                logger.info(f"📥 [TELEGRAM] Downloading indexed file: {video_id}")
+                await nand.download_media(file_id, file_name=file_path)
+            except Exception as e:
+                logger.warning(f"⚠️ [TELEGRAM] Indexed file_id failed for {video_id}: {e}")
+
+        if not os.path.exists(file_path):
+            # Parse Telegram link: https://t.me/channelname/messageid
+            parsed = urlparse(telegram_link)
+            parts = parsed.path.strip("/").split("/")
+            
+            if len(parts) < 2:
+                logger.error(f"❌ Invalid Telegram link format: {telegram_link}")
+                return None
+                
+            channel_name = parts[0]
+            message_id = int(parts[1])
+            
+            logger.info(f"📥 [TELEGRAM] Downloading from @{channel_name}/{message_id}")
+            
+            # Pyrogram se message fetch karke download
+            msg = await nand.get_messages(channel_name, message_id)
+            await msg.download(file_name=file_path)
+
+            media = msg.audio or msg.video or msg.document or msg.voice
+            if media:
+                await save_tg_file(video_id, file_type, telegram_link, media.file_id)
         
         # Wait karo jab tak file fully download na ho
         timeout = 0
@@ -105,216 +169,259 @@ async def get_telegram_file(telegram_link: str, video_id: str, file_type: str) -
         logger.error(f"❌ [TELEGRAM] Failed to download {video_id}: {e}")
         return None
 
-async def download_song(link: str) -> str:
-    global YOUR_API_URL
-    
-    if not YOUR_API_URL:
-        await load_api_url()
-        if not YOUR_API_URL:
-            logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
-            logger.error("API URL not available")
-            return None
-    
-    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
-    logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
-    logger.info(f"🎵 [AUDIO] Starting download for: {video_id}")
 
-    if not video_id or len(video_id) < 3:
+async def get_indexed_file(video_id: str, file_type: str) -> str:
+    """
+    Tracks the API already uploaded to Telegram are fetched from there
+    directly, skipping the API round trip.
+    """
+    indexed = await get_tg_file(video_id, file_type)
+    if not indexed:
+        tg_index_stats["misses"] += 1
         return None
+    downloaded_file = await get_telegram_file(
+        indexed["link"], video_id, file_type, indexed.get("file_id")
+    )
+    if downloaded_file:
+        tg_index_stats["hits"] += 1
+        return downloaded_file
+    # Stale entry, the API is asked again and re-indexes the upload
+    await delete_tg_file(video_id, file_type)
+    tg_index_stats["misses"] += 1
+    tg_index_stats["invalidations"] += 1
+    return None
 
-    DOWNLOAD_DIR = "downloads"
-    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.webm")
 
-    # Local check
-    if os.path.exists(file_path):
-        logger.info(f"🎵 [LOCAL] File exists: {video_id}")
-        return file_path
-
-    try:
-        async with aiohttp.ClientSession() as session:
-            params = {"url": video_id, "type": "audio"}
-            
-            async with session.get(
-                f"{YOUR_API_URL}/download",
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                data = await response.json()
-
-                if response.status != 200:
-                    logger.error(f"[AUDIO] API error: {response.status}")
-                    return None
-
-                # Format 1: Direct Telegram link (already uploaded)
-                if data.get("link") and "t.me" in str(data.get("link")):
-                    telegram_link = data["link"]
-                    logger.info(f"🔗 [AUDIO] Telegram link received: {telegram_link}")
-                    
-                    # Telegram se download karo
-                    downloaded_file = await get_telegram_file(telegram_link, video_id, "audio")
-                    if downloaded_file:
-                        return downloaded_file
-                    else:
-                        logger.warning(f"⚠️ [AUDIO] Telegram download failed")
-                        return None
-                
-                # Format 2: Stream URL (not yet uploaded)
-                elif data.get("status") == "success" and data.get("stream_url"):
-                    stream_url = data["stream_url"]
-                    logger.info(f"[AUDIO] Stream URL obtained: {video_id}")
-                    
-                    # Download from stream URL
-                    async with session.get(
-                        stream_url,
-                        timeout=aiohttp.ClientTimeout(total=300)
-                    ) as file_response:
-                        if file_response.status != 200:
-                            logger.error(f"[AUDIO] Download failed: {file_response.status}")
-                            return None
-                            
-                        with open(file_path, "wb") as f:
-                            async for chunk in file_response.content.iter_chunked(16384):
-                                f.write(chunk)
-                        
-                        logger.info(f"🎉 [AUDIO] Downloaded: {video_id}")
-                        return file_path
-                else:
-                    logger.error(f"[AUDIO] Invalid response: {data}")
-                    return None
-
-    except asyncio.TimeoutError:
-        logger.error(f"[AUDIO] Timeout: {video_id}")
+async def download_media(link: str, media_type: str, stream: bool = False) -> str:
+    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
+    if not video_id or len(video_id) < 3:
         return None
+    key = (video_id, media_type)
+    # Track is still being copied into the cache from its stream URL
+    if key in stream_urls:
+        stream_url, file_path = stream_urls[key]
+        if stream and config.STREAM_WHILE_DOWNLOAD:
+            return stream_url
+        return await fills.do(key, fill_media, key, stream_url, file_path)
+    # Concurrent plays of the same track share one download
+    return await downloads.do(key, fetch_media, video_id, media_type, stream)
+
+
+async def fill_media(key, stream_url: str, file_path: str) -> str:
+    try:
+        downloaded_file = await download_file(
+            stream_url,
+            file_path,
+            timeout=300 if key[1] == "audio" else 600,
+        )
+        if downloaded_file:
+            media_cache.put(downloaded_file)
+        return downloaded_file
     except Exception as e:
-        logger.error(f"[AUDIO] Exception: {video_id} - {e}")
+        LOGGER("ShrutixMusic/platforms/Youtube.py").error(f"Cache fill failed: {key[0]} - {e}")
         return None
+    finally:
+        stream_urls.pop(key, None)
+
+
+class DownloadBackend(ABC):
+    """
+    A way for fetch_media to get a track into the downloads folder. Backends
+    are tried fastest first by measured throughput, skipping those whose
+    circuit breaker is open.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.throughput = None
+        self.successes = 0
+        self.failures = 0
+
+    def available(self) -> bool:
+        return self.breaker.usable
+
+    @abstractmethod
+    async def fetch(self, video_id: str, media_type: str, file_path: str, stream: bool) -> str:
+        """Returns file_path or a playable stream url, None on failure."""
+
+    def record(self, ok: bool, size: int = None, elapsed: float = None):
+        if not ok:
+            self.failures += 1
+            self.breaker.failure()
+            return
+        self.successes += 1
+        self.breaker.success()
+        if size and elapsed:
+            rate = size / max(elapsed, 0.001)
+            self.throughput = (
+                rate if self.throughput is None else self.throughput * 0.8 + rate * 0.2
+            )
+
+    def stats(self) -> dict:
+        return {
+            "throughput": self.throughput,
+            "successes": self.successes,
+            "failures": self.failures,
+            "state": self.breaker.state,
+        }
+
+
+class ApiBackend(DownloadBackend):
+    name = "api"
 
+    def available(self) -> bool:
+        # At least one endpoint must be usable, the same test candidates() applies
+        return super().available() and api_endpoints.available()
 
-async def download_video(link: str) -> str:
-    global YOUR_API_URL
-    
-    if not YOUR_API_URL:
-        await load_api_url()
-        if not YOUR_API_URL:
-            logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
-            logger.error("API URL not available")
+    async def fetch(self, video_id: str, media_type: str, file_path: str, stream: bool) -> str:
+        logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
+        tag = "[AUDIO]" if media_type == "audio" else "[VIDEO]"
+        try:
+            data = await request_download(video_id, media_type)
+            if not data:
+                logger.error(f"{tag} API error: {video_id}")
+                return None
+
+            # Format 1: Direct Telegram link (already uploaded)
+            if data.get("link") and "t.me" in str(data.get("link")):
+                telegram_link = data["link"]
+                logger.info(f"🔗 {tag} Telegram link received: {telegram_link}")
+
+                # Telegram se download karo
+                downloaded_file = await get_telegram_file(telegram_link, video_id, media_type)
+                if not downloaded_file:
+                    logger.warning(f"⚠️ {tag} Telegram download failed")
+                return downloaded_file
+
+            # Format 2: Stream URL (not yet uploaded)
+            elif data.get("status") == "success" and data.get("stream_url"):
+                stream_url = data["stream_url"]
+                logger.info(f"{tag} Stream URL obtained: {video_id}")
+
+                key = (video_id, media_type)
+                stream_urls[key] = (stream_url, file_path)
+                if stream and config.STREAM_WHILE_DOWNLOAD:
+                    # Play straight from the stream URL, the cache copy finishes in the background
+                    asyncio.ensure_future(fills.do(key, fill_media, key, stream_url, file_path))
+                    logger.info(f"▶️ {tag} Streaming while downloading: {video_id}")
+                    return stream_url
+
+                # Download from stream URL
+                downloaded_file = await fills.do(key, fill_media, key, stream_url, file_path)
+                if not downloaded_file:
+                    logger.error(f"{tag} Download failed: {video_id}")
+                return downloaded_file
+            else:
+                logger.error(f"{tag} Invalid response: {data}")
+                return None
+
+        except asyncio.TimeoutError:
+            logger.error(f"{tag} Timeout: {video_id}")
+            return None
+        except Exception as e:
+            logger.error(f"{tag} Exception: {video_id} - {e}")
             return None
-    
-    video_id = link.split('v=')[-1].split('&')[0] if 'v=' in link else link
-    logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
-    logger.info(f"🎥 [VIDEO] Starting download for: {video_id}")
 
-    if not video_id or len(video_id) < 3:
-        return None
+
+class YtDlpBackend(DownloadBackend):
+    """Local fallback, runs yt-dlp in the worker processes with the cookies/ files."""
+
+    name = "yt-dlp"
+
+    async def fetch(self, video_id: str, media_type: str, file_path: str, stream: bool) -> str:
+        logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
+        tag = "[AUDIO]" if media_type == "audio" else "[VIDEO]"
+        try:
+            cookie_file = cookie_txt_file()
+        except FileNotFoundError:
+            cookie_file = None
+        try:
+            await download_pool.run(
+                ytdlp.download,
+                f"https://www.youtube.com/watch?v={video_id}",
+                media_type,
+                file_path,
+                cookie_file,
+            )
+        except Exception as e:
+            logger.error(f"{tag} yt-dlp failed: {video_id} - {e}")
+            return None
+        return file_path
+
+
+backends = [ApiBackend(), YtDlpBackend()]
+
+
+def ranked_backends() -> list:
+    """Available backends, fastest measured throughput first, otherwise in listed order."""
+    usable = [backend for backend in backends if backend.available()]
+    return sorted(usable, key=lambda backend: -(backend.throughput or 0))
+
+
+async def fetch_media(video_id: str, media_type: str, stream: bool = False) -> str:
+    logger = LOGGER("ShrutixMusic/platforms/Youtube.py")
+    icon, tag = ("🎵", "[AUDIO]") if media_type == "audio" else ("🎥", "[VIDEO]")
+    logger.info(f"{icon} {tag} Starting download for: {video_id}")
 
     DOWNLOAD_DIR = "downloads"
     os.makedirs(DOWNLOAD_DIR, exist_ok=True)
-    file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}.mkv")
+    extension = ".webm" if media_type == "audio" else ".mkv"
+    file_path = os.path.join(DOWNLOAD_DIR, f"{video_id}{extension}")
 
-    # Local check
-    if os.path.exists(file_path):
-        logger.info(f"🎥 [LOCAL] File exists: {video_id}")
+    # Cache check
+    if media_cache.get(file_path):
+        logger.info(f"{icon} [CACHE] Hit: {video_id}")
         return file_path
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            params = {"url": video_id, "type": "video"}
-            
-            async with session.get(
-                f"{YOUR_API_URL}/download",
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=60)
-            ) as response:
-                data = await response.json()
-
-                if response.status != 200:
-                    logger.error(f"[VIDEO] API error: {response.status}")
-                    return None
-
-                # Format 1: Direct Telegram link (already uploaded)
-                if data.get("link") and "t.me" in str(data.get("link")):
-                    telegram_link = data["link"]
-                    logger.info(f"🔗 [VIDEO] Telegram link received: {telegram_link}")
-                    
-                    # Telegram se download karo
-                    downloaded_file = await get_telegram_file(telegram_link, video_id, "video")
-                    if downloaded_file:
-                        return downloaded_file
-                    else:
-                        logger.warning(f"⚠️ [VIDEO] Telegram download failed")
-                        return None
-                
-                # Format 2: Stream URL (not yet uploaded)
-                elif data.get("status") == "success" and data.get("stream_url"):
-                    stream_url = data["stream_url"]
-                    logger.info(f"[VIDEO] Stream URL obtained: {video_id}")
-                    
-                    # Download from stream URL
-                    async with session.get(
-                        stream_url,
-                        timeout=aiohttp.ClientTimeout(total=600)
-                    ) as file_response:
-                        if file_response.status != 200:
-                            logger.error(f"[VIDEO] Download failed: {file_response.status}")
-                            return None
-                            
-                        with open(file_path, "wb") as f:
-                            async for chunk in file_response.content.iter_chunked(16384):
-                                f.write(chunk)
-                        
-                        logger.info(f"🎉 [VIDEO] Downloaded: {video_id}")
-                        return file_path
-                else:
-                    logger.error(f"[VIDEO] Invalid response: {data}")
-                    return None
+    # Telegram index check
+    downloaded_file = await get_indexed_file(video_id, media_type)
+    if downloaded_file:
+        logger.info(f"🔗 {tag} Telegram index hit: {video_id}")
+        media_cache.put(downloaded_file)
+        return downloaded_file
+
+    loop = asyncio.get_running_loop()
+    for backend in ranked_backends():
+        start = loop.time()
+        result = await backend.fetch(video_id, media_type, file_path, stream)
+        if not result:
+            backend.record(False)
+            continue
+        if os.path.isfile(result):
+            backend.record(True, os.path.getsize(result), loop.time() - start)
+            if not media_cache.contains(result):
+                media_cache.put(result)
+            logger.info(f"🎉 {tag} Downloaded via {backend.name}: {video_id}")
+        else:
+            backend.record(True)
+        return result
+    logger.error(f"{tag} No download backend succeeded: {video_id}")
+    return None
 
-    except asyncio.TimeoutError:
-        logger.error(f"[VIDEO] Timeout: {video_id}")
-        return None
-    except Exception as e:
-        logger.error(f"[VIDEO] Exception: {video_id} - {e}")
-        return None
 
-async def check_file_size(link):
-    async def get_format_info(link):
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            print("No cookies found. Cannot check file size.")
-            return None
-            
-        proc = await asyncio.create_subprocess_exec(
-            "yt-dlp",
-            "--cookies", cookie_file,
-            "-J",
-            link,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            print(f'Error:\n{stderr.decode()}')
-            return None
-        return json.loads(stdout.decode())
+async def download_song(link: str, stream: bool = False) -> str:
+    return await download_media(link, "audio", stream)
+
 
-    def parse_size(formats):
-        total_size = 0
-        for format in formats:
-            if 'filesize' in format:
-                total_size += format['filesize']
-        return total_size
+async def download_video(link: str, stream: bool = False) -> str:
+    return await download_media(link, "video", stream)
 
-    info = await get_format_info(link)
-    if info is None:
+async def check_file_size(link):
+    cookie_file = cookie_txt_file()
+    if not cookie_file:
+        print("No cookies found. Cannot check file size.")
         return None
-    
-    formats = info.get('formats', [])
-    if not formats:
+    try:
+        sizes = await worker_pool.run(ytdlp.format_sizes, link, cookie_file)
+    except Exception as e:
+        print(f'Error:\n{e}')
+        return None
+    if not sizes:
         print("No formats found.")
         return None
-    
-    total_size = parse_size(formats)
-    return total_size
+    return sum(sizes)
 
 async def shell_cmd(cmd):
     proc = await asyncio.create_subprocess_shell(
@@ -365,41 +472,39 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            duration_sec = int(time_to_seconds(duration_min)) if duration_min else 0
-        return title, duration_min, duration_sec, thumbnail, vidid
+        info = await track_info.get(link)
+        if not info:
+            raise ValueError(f"No results found for {link}")
+        duration_min = info["duration"]
+        duration_sec = int(time_to_seconds(duration_min)) if duration_min else 0
+        return info["title"], duration_min, duration_sec, info["thumbnail"], info["id"]
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            return result["title"]
+        info = await track_info.get(link)
+        if info:
+            return info["title"]
 
     async def duration(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            return result["duration"]
+        info = await track_info.get(link)
+        if info:
+            return info["duration"]
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            return result["thumbnails"][0]["url"].split("?")[0]
+        info = await track_info.get(link)
+        if info:
+            return info["thumbnail"]
 
     async def video(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -415,43 +520,75 @@ class YouTubeAPI:
         except Exception as e:
             return 0, f"Video download error: {e}"
 
-    async def playlist(self, link, limit, user_id, videoid: Union[bool, str] = None):
+    async def playlist_stream(self, link, limit, user_id, videoid: Union[bool, str] = None):
+        """
+        Video ids of the first limit playlist entries, yielded while yt-dlp
+        is still listing the playlist so the first track can start before
+        the listing is done.
+        """
         if videoid:
             link = self.listbase + link
         if "&" in link:
             link = link.split("&")[0]
-        cookie_file = cookie_txt_file()
-        if not cookie_file:
-            return []
-        playlist = await shell_cmd(
-            f"yt-dlp -i --get-id --flat-playlist --cookies {cookie_file} --playlist-end {limit} --skip-download {link}"
-        )
         try:
-            result = [key for key in playlist.split("\n") if key]
-        except:
-            result = []
-        return result
+            cookie_file = cookie_txt_file()
+        except FileNotFoundError:
+            cookie_file = None
+        loop = asyncio.get_running_loop()
+        ids = asyncio.Queue()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for vidid in ytdlp.iter_playlist(link, limit, cookie_file):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(ids.put_nowait, vidid)
+            except Exception as e:
+                LOGGER("ShrutixMusic/platforms/Youtube.py").error(f"Playlist listing failed: {e}")
+            finally:
+                loop.call_soon_threadsafe(ids.put_nowait, None)
+
+        loop.run_in_executor(listers, produce)
+        try:
+            while True:
+                vidid = await ids.get()
+                if vidid is None:
+                    break
+                yield vidid
+        finally:
+            stop.set()
 
     async def track(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            vidid = result["id"]
-            yturl = result["link"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": yturl,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
+        info = await track_info.get(link)
+        if not info:
+            raise ValueError(f"No results found for {link}")
+        return self._track_details(info), info["id"]
+
+    async def search(self, query: str):
+        """
+        Same as track for a search query, but fetches the whole slider page.
+        The page is also stored under the 20 characters the slider buttons
+        carry, so browsing it needs no further searches.
+        """
+        results = await track_info.search(query, limit=10, alias=query[:20])
+        if not results:
+            raise ValueError(f"No results found for {query}")
+        return self._track_details(results[0]), results[0]["id"]
+
+    @staticmethod
+    def _track_details(info: dict) -> dict:
+        return {
+            "title": info["title"],
+            "link": info["link"],
+            "vidid": info["id"],
+            "duration_min": info["duration"],
+            "thumb": info["thumbnail"],
         }
-        return track_details, vidid
 
     async def formats(self, link: str, videoid: Union[bool, str] = None):
         if videoid:
@@ -461,26 +598,7 @@ class YouTubeAPI:
         cookie_file = cookie_txt_file()
         if not cookie_file:
             return [], link
-        ytdl_opts = {"quiet": True, "cookiefile": cookie_file}
-        ydl = yt_dlp.YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
-                try:
-                    if "dash" not in str(format["format"]).lower():
-                        formats_available.append(
-                            {
-                                "format": format["format"],
-                                "filesize": format.get("filesize"),
-                                "format_id": format["format_id"],
-                                "ext": format["ext"],
-                                "format_note": format["format_note"],
-                                "yturl": link,
-                            }
-                        )
-                except:
-                    continue
+        formats_available = await worker_pool.run(ytdlp.formats, link, cookie_file)
         return formats_available, link
 
     async def slider(self, link: str, query_type: int, videoid: Union[bool, str] = None):
@@ -488,13 +606,11 @@ class YouTubeAPI:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
-        title = result[query_type]["title"]
-        duration_min = result[query_type]["duration"]
-        vidid = result[query_type]["id"]
-        thumbnail = result[query_type]["thumbnails"][0]["url"].split("?")[0]
-        return title, duration_min, thumbnail, vidid
+        results = await track_info.search(link, limit=10)
+        if not results:
+            raise ValueError(f"No results found for {link}")
+        info = results[query_type % len(results)]
+        return info["title"], info["duration"], info["thumbnail"], info["id"]
 
     async def download(
         self,
@@ -506,27 +622,30 @@ class YouTubeAPI:
         songvideo: Union[bool, str] = None,
         format_id: Union[bool, str] = None,
         title: Union[bool, str] = None,
+        stream: Union[bool, str] = True,
     ) -> str:
         if videoid:
             link = self.base + link
 
         try:
+            # direct is False when playback starts from the stream URL,
+            # the queue then keeps vid_ so the cached copy is picked up later
             if songvideo or songaudio:
-                downloaded_file = await download_song(link)
+                downloaded_file = await download_song(link, stream)
                 if downloaded_file:
-                    return downloaded_file, True
+                    return downloaded_file, os.path.exists(downloaded_file)
                 else:
                     return None, False
             elif video:
-                downloaded_file = await download_video(link)
+                downloaded_file = await download_video(link, stream)
                 if downloaded_file:
-                    return downloaded_file, True
+                    return downloaded_file, os.path.exists(downloaded_file)
                 else:
                     return None, False
             else:
-                downloaded_file = await download_song(link)
+                downloaded_file = await download_song(link, stream)
                 if downloaded_file:
-                    return downloaded_file, True
+                    return downloaded_file, os.path.exists(downloaded_file)
                 else:
                     return None, False
         except Exception as e:
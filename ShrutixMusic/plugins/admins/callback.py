@@ -21,7 +21,8 @@ from ShrutixMusic.utils.decorators.language import languageCB
 from ShrutixMusic.utils.formatters import seconds_to_min
 from ShrutixMusic.utils.inline import close_markup, stream_markup, stream_markup_timer
 from ShrutixMusic.utils.stream.autoclear import auto_clean
-from ShrutixMusic.utils.thumbnails import get_thumb
+from ShrutixMusic.utils.stream.prefetch import prefetcher
+from ShrutixMusic.utils.thumbnails import get_thumb, send_card
 from config import (
     BANNED_USERS,
     SUPPORT_CHAT,
@@ -197,6 +198,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         else:
             txt = f"➻ sᴛʀᴇᴀᴍ ʀᴇ-ᴘʟᴀʏᴇᴅ 🎄\n│ \n└ʙʏ : {mention} 🥀"
         await CallbackQuery.answer()
+        prefetcher.schedule(chat_id)
         queued = check[0]["file"]
         title = (check[0]["title"]).title()
         user = check[0]["by"]
@@ -209,7 +211,6 @@ async def del_back_playlist(client, CallbackQuery, _):
         if exis:
             db[chat_id][0]["dur"] = exis
             db[chat_id][0]["seconds"] = check[0]["old_second"]
-            db[chat_id][0]["speed_path"] = None
             db[chat_id][0]["speed"] = 1.0
         if "live_" in queued:
             n, link = await YouTube.video(videoid, True)
@@ -228,8 +229,10 @@ async def del_back_playlist(client, CallbackQuery, _):
                 return await CallbackQuery.message.reply_text(_["call_6"])
             button = stream_markup(_, chat_id)
             img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
-                photo=img,
+            run = await send_card(
+                videoid,
+                img,
+                CallbackQuery.message.reply_photo,
                 caption=_["stream_1"].format(
                     f"https://t.me/{nand.username}?start=info_{videoid}",
                     title[:23],
@@ -264,8 +267,10 @@ async def del_back_playlist(client, CallbackQuery, _):
                 return await mystic.edit_text(_["call_6"])
             button = stream_markup(_, chat_id)
             img = await get_thumb(videoid)
-            run = await CallbackQuery.message.reply_photo(
-                photo=img,
+            run = await send_card(
+                videoid,
+                img,
+                CallbackQuery.message.reply_photo,
                 caption=_["stream_1"].format(
                     f"https://t.me/{nand.username}?start=info_{videoid}",
                     title[:23],
@@ -335,8 +340,10 @@ async def del_back_playlist(client, CallbackQuery, _):
             else:
                 button = stream_markup(_, chat_id)
                 img = await get_thumb(videoid)
-                run = await CallbackQuery.message.reply_photo(
-                    photo=img,
+                run = await send_card(
+                    videoid,
+                    img,
+                    CallbackQuery.message.reply_photo,
                     caption=_["stream_1"].format(
                         f"https://t.me/{nand.username}?start=info_{videoid}",
                         title[:23],
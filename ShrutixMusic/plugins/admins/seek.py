@@ -31,6 +31,8 @@ async def seek_comm(cli, message: Message, _, chat_id):
     duration_played = int(playing[0]["played"])
     duration_to_skip = int(query)
     duration = playing[0]["dur"]
+    # Positions are in played time, the file is seeked in its own time
+    speed = float(playing[0].get("speed") or 1.0)
     if message.command[0][-2] == "c":
         if (duration_played - duration_to_skip) <= 10:
             return await message.reply_text(
@@ -50,18 +52,16 @@ async def seek_comm(cli, message: Message, _, chat_id):
         n, file_path = await YouTube.video(playing[0]["vidid"], True)
         if n == 0:
             return await message.reply_text(_["admin_22"])
-    check = (playing[0]).get("speed_path")
-    if check:
-        file_path = check
     if "index_" in file_path:
         file_path = playing[0]["vidid"]
     try:
         await Shruti.seek_stream(
             chat_id,
             file_path,
-            seconds_to_min(to_seek),
-            duration,
+            seconds_to_min(to_seek * speed),
+            playing[0].get("old_dur") or duration,
             playing[0]["streamtype"],
+            speed,
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
@@ -9,7 +9,8 @@ from ShrutixMusic.utils.database import get_loop
 from ShrutixMusic.utils.decorators import AdminRightsCheck
 from ShrutixMusic.utils.inline import close_markup, stream_markup
 from ShrutixMusic.utils.stream.autoclear import auto_clean
-from ShrutixMusic.utils.thumbnails import get_thumb
+from ShrutixMusic.utils.stream.prefetch import prefetcher
+from ShrutixMusic.utils.thumbnails import get_thumb, send_card
 from config import BANNED_USERS
 
 
@@ -89,6 +90,7 @@ async def skip(cli, message: Message, _, chat_id):
                 return await Shruti.stop_stream(chat_id)
             except:
                 return
+    prefetcher.schedule(chat_id)
     queued = check[0]["file"]
     title = (check[0]["title"]).title()
     user = check[0]["by"]
@@ -100,7 +102,6 @@ async def skip(cli, message: Message, _, chat_id):
     if exis:
         db[chat_id][0]["dur"] = exis
         db[chat_id][0]["seconds"] = check[0]["old_second"]
-        db[chat_id][0]["speed_path"] = None
         db[chat_id][0]["speed"] = 1.0
     if "live_" in queued:
         n, link = await YouTube.video(videoid, True)
@@ -116,8 +117,10 @@ async def skip(cli, message: Message, _, chat_id):
             return await message.reply_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await get_thumb(videoid)
-        run = await message.reply_photo(
-            photo=img,
+        run = await send_card(
+            videoid,
+            img,
+            message.reply_photo,
             caption=_["stream_1"].format(
                 f"https://t.me/{nand.username}?start=info_{videoid}",
                 title[:23],
@@ -149,8 +152,10 @@ async def skip(cli, message: Message, _, chat_id):
             return await mystic.edit_text(_["call_6"])
         button = stream_markup(_, chat_id)
         img = await get_thumb(videoid)
-        run = await message.reply_photo(
-            photo=img,
+        run = await send_card(
+            videoid,
+            img,
+            message.reply_photo,
             caption=_["stream_1"].format(
                 f"https://t.me/{nand.username}?start=info_{videoid}",
                 title[:23],
@@ -218,8 +223,10 @@ async def skip(cli, message: Message, _, chat_id):
         else:
             button = stream_markup(_, chat_id)
             img = await get_thumb(videoid)
-            run = await message.reply_photo(
-                photo=img,
+            run = await send_card(
+                videoid,
+                img,
+                message.reply_photo,
                 caption=_["stream_1"].format(
                     f"https://t.me/{nand.username}?start=info_{videoid}",
                     title[:23],
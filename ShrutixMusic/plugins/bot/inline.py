@@ -1,48 +1,54 @@
+import asyncio
+
 from pyrogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
     InlineQueryResultPhoto,
 )
-from py_yt import VideosSearch
 
 from ShrutixMusic import nand
 from ShrutixMusic.utils.inlinequery import answer
+from ShrutixMusic.utils.trackinfo import track_info
+from ShrutixMusic.utils.ttlcache import TTLCache
 from config import BANNED_USERS
 
+# Seconds Telegram may serve our answer for the same query on its own, answers
+# borrowed from a longer query are only cached briefly and for that user
+CACHE_TIME = 300
+APPROX_CACHE_TIME = 5
+# Seconds a keystroke waits for the next one before searching
+DEBOUNCE = 0.4
+# How many characters a user may delete from a recent query and still get its answers
+PREFIX_SLACK = 2
 
-@nand.on_inline_query(~BANNED_USERS)
-async def inline_query_handler(client, query):
-    text = query.query.strip().lower()
+results = TTLCache(1000, 600)
+recent = TTLCache(5000, 60)
+latest = {}
+
+
+def build_answers(records):
     answers = []
-    if text.strip() == "":
-        try:
-            await client.answer_inline_query(query.id, results=answer, cache_time=10)
-        except:
-            return
-    else:
-        a = VideosSearch(text, limit=20)
-        result = (await a.next()).get("result")
-        for x in range(15):
-            title = (result[x]["title"]).title()
-            duration = result[x]["duration"]
-            views = result[x]["viewCount"]["short"]
-            thumbnail = result[x]["thumbnails"][0]["url"].split("?")[0]
-            channellink = result[x]["channel"]["link"]
-            channel = result[x]["channel"]["name"]
-            link = result[x]["link"]
-            published = result[x]["publishedTime"]
-            description = f"{views} | {duration} ᴍɪɴᴜᴛᴇs | {channel}  | {published}"
-            buttons = InlineKeyboardMarkup(
+    for result in records[:15]:
+        title = (result["title"]).title()
+        duration = result["duration"]
+        views = result["views"]
+        thumbnail = result["thumbnail"]
+        channellink = result["channel_link"]
+        channel = result["channel"]
+        link = result["link"]
+        published = result["published"]
+        description = f"{views} | {duration} ᴍɪɴᴜᴛᴇs | {channel}  | {published}"
+        buttons = InlineKeyboardMarkup(
+            [
                 [
-                    [
-                        InlineKeyboardButton(
-                            text="ʏᴏᴜᴛᴜʙᴇ 🎄",
-                            url=link,
-                        )
-                    ],
-                ]
-            )
-            searched_text = f"""
+                    InlineKeyboardButton(
+                        text="ʏᴏᴜᴛᴜʙᴇ 🎄",
+                        url=link,
+                    )
+                ],
+            ]
+        )
+        searched_text = f"""
 ❄ <b>ᴛɪᴛʟᴇ :</b> <a href={link}>{title}</a>
 
 ⏳ <b>ᴅᴜʀᴀᴛɪᴏɴ :</b> {duration} ᴍɪɴᴜᴛᴇs
@@ -52,18 +58,66 @@ async def inline_query_handler(client, query):
 
 
 <u><b>➻ ɪɴʟɪɴᴇ sᴇᴀʀᴄʜ ᴍᴏᴅᴇ ʙʏ {nand.name}</b></u>"""
-            answers.append(
-                InlineQueryResultPhoto(
-                    photo_url=thumbnail,
-                    title=title,
-                    thumb_url=thumbnail,
-                    description=description,
-                    caption=searched_text,
-                    reply_markup=buttons,
-                )
+        answers.append(
+            InlineQueryResultPhoto(
+                photo_url=thumbnail,
+                title=title,
+                thumb_url=thumbnail,
+                description=description,
+                caption=searched_text,
+                reply_markup=buttons,
             )
+        )
+    return answers
+
+
+def cached_answers(user_id, text):
+    """
+    (answers, exact) for text. When the user just deleted a few characters
+    of their last query, its answers are reused with exact set to False.
+    """
+    answers = results.get(text)
+    if answers is not None:
+        return answers, True
+    last = recent.get(user_id)
+    if last and last.startswith(text) and len(last) - len(text) <= PREFIX_SLACK:
+        return results.get(last), False
+    return None, True
+
+
+@nand.on_inline_query(~BANNED_USERS)
+async def inline_query_handler(client, query):
+    text = " ".join(query.query.lower().split())
+    user_id = query.from_user.id
+    if text == "":
+        try:
+            await client.answer_inline_query(query.id, results=answer, cache_time=10)
+        except:
+            return
+    else:
+        answers, exact = cached_answers(user_id, text)
+        if answers is None:
+            latest[user_id] = query.id
+            await asyncio.sleep(DEBOUNCE)
+            if latest.get(user_id) != query.id:
+                # A newer keystroke from this user replaced this query
+                return
+            try:
+                answers = build_answers(await track_info.search(text, limit=20))
+            except:
+                return
+            finally:
+                if latest.get(user_id) == query.id:
+                    latest.pop(user_id, None)
+            if answers:
+                results.set(text, answers)
+                recent.set(user_id, text)
         try:
-            return await client.answer_inline_query(query.id, results=answers)
+            return await client.answer_inline_query(
+                query.id,
+                results=answers,
+                cache_time=CACHE_TIME if exact else APPROX_CACHE_TIME,
+                is_personal=not exact,
+            )
         except:
             return
-
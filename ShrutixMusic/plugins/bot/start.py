@@ -3,7 +3,6 @@ import time
 from pyrogram import filters
 from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
-from py_yt import VideosSearch
 
 import config
 from ShrutixMusic import nand
@@ -20,6 +19,7 @@ from ShrutixMusic.utils.database import (
 from ShrutixMusic.utils.decorators.language import LanguageStart
 from ShrutixMusic.utils.formatters import get_readable_time
 from ShrutixMusic.utils.inline import help_pannel, private_panel, start_panel
+from ShrutixMusic.utils.trackinfo import track_info
 from config import BANNED_USERS
 from strings import get_string
 
@@ -49,16 +49,15 @@ async def start_pm(client, message: Message, _):
             m = await message.reply_text("🔎")
             query = (str(name)).replace("info_", "", 1)
             query = f"https://www.youtube.com/watch?v={query}"
-            results = VideosSearch(query, limit=1)
-            for result in (await results.next())["result"]:
-                title = result["title"]
-                duration = result["duration"]
-                views = result["viewCount"]["short"]
-                thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-                channellink = result["channel"]["link"]
-                channel = result["channel"]["name"]
-                link = result["link"]
-                published = result["publishedTime"]
+            info = await track_info.get(query)
+            title = info["title"]
+            duration = info["duration"]
+            views = info["views"]
+            thumbnail = info["thumbnail"]
+            channellink = info["channel_link"]
+            channel = info["channel"]
+            link = info["link"]
+            published = info["published"]
             searched_text = _["start_6"].format(
                 title, duration, views, published, channellink, channel, nand.mention
             )
@@ -157,14 +157,12 @@ async def play_commnd(
     elif url:
         if await YouTube.exists(url):
             if "playlist" in url:
-                try:
-                    details = await YouTube.playlist(
-                        url,
-                        config.PLAYLIST_FETCH_LIMIT,
-                        message.from_user.id,
-                    )
-                except:
-                    return await mystic.edit_text(_["play_3"])
+                # Listed lazily, stream() starts playing while it is still running
+                details = YouTube.playlist_stream(
+                    url,
+                    config.PLAYLIST_FETCH_LIMIT,
+                    message.from_user.id,
+                )
                 streamtype = "playlist"
                 plist_type = "yt"
                 if "&" in url:
@@ -258,7 +256,7 @@ async def play_commnd(
             cap = _["play_10"].format(details["title"], details["duration_min"])
         elif await SoundCloud.valid(url):
             try:
-                details, track_path = await SoundCloud.download(url)
+                details, track_path = await SoundCloud.download(url, mystic, _)
             except:
                 return await mystic.edit_text(_["play_3"])
             duration_sec = details["duration_sec"]
@@ -328,7 +326,7 @@ async def play_commnd(
         if "-v" in query:
             query = query.replace("-v", "")
         try:
-            details, track_id = await YouTube.track(query)
+            details, track_id = await YouTube.search(query)
         except:
             return await mystic.edit_text(_["play_3"])
         streamtype = "youtube"
@@ -549,15 +547,12 @@ async def play_playlists_command(client, CallbackQuery, _):
     spotify = True
     if ptype == "yt":
         spotify = False
-        try:
-            result = await YouTube.playlist(
-                videoid,
-                config.PLAYLIST_FETCH_LIMIT,
-                CallbackQuery.from_user.id,
-                True,
-            )
-        except:
-            return await mystic.edit_text(_["play_3"])
+        result = YouTube.playlist_stream(
+            videoid,
+            config.PLAYLIST_FETCH_LIMIT,
+            CallbackQuery.from_user.id,
+            True,
+        )
     if ptype == "spplay":
         try:
             result, spotify_id = await Spotify.playlist(videoid)
@@ -624,11 +619,14 @@ async def slider_queries(client, CallbackQuery, _):
             query_type = 0
         else:
             query_type = int(rtype + 1)
+        try:
+            title, duration_min, thumbnail, vidid = await YouTube.slider(query, query_type)
+        except ValueError:
+            return await CallbackQuery.answer(_["play_3"], show_alert=True)
         try:
             await CallbackQuery.answer(_["playcb_2"])
         except:
             pass
-        title, duration_min, thumbnail, vidid = await YouTube.slider(query, query_type)
         buttons = slider_markup(_, vidid, user_id, query, query_type, cplay, fplay)
         med = InputMediaPhoto(
             media=thumbnail,
@@ -645,11 +643,14 @@ async def slider_queries(client, CallbackQuery, _):
             query_type = 9
         else:
             query_type = int(rtype - 1)
+        try:
+            title, duration_min, thumbnail, vidid = await YouTube.slider(query, query_type)
+        except ValueError:
+            return await CallbackQuery.answer(_["play_3"], show_alert=True)
         try:
             await CallbackQuery.answer(_["playcb_2"])
         except:
             pass
-        title, duration_min, thumbnail, vidid = await YouTube.slider(query, query_type)
         buttons = slider_markup(_, vidid, user_id, query, query_type, cplay, fplay)
         med = InputMediaPhoto(
             media=thumbnail,
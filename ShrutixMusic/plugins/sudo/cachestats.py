@@ -0,0 +1,105 @@
+from pyrogram import filters
+from pyrogram.types import Message
+
+from ShrutixMusic import nand
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.core.workers import download_pool, worker_pool
+from ShrutixMusic.misc import SUDOERS
+from ShrutixMusic.platforms.Youtube import backends, tg_index_stats
+from ShrutixMusic.utils.endpoints import api_endpoints
+from ShrutixMusic.utils.formatters import convert_bytes
+from ShrutixMusic.utils.mediacache import media_cache
+from ShrutixMusic.utils.trackinfo import track_info
+from ShrutixMusic.utils.trackmatch import track_matches
+
+
+@nand.on_message(filters.command(["cachestats"]) & SUDOERS)
+async def cache_stats(_, message: Message):
+    stats = media_cache.stats()
+    text = (
+        "<b><u>ᴍᴇᴅɪᴀ ᴄᴀᴄʜᴇ :</u></b>\n\n"
+        f"<b>ᴛʀᴀᴄᴋs :</b> <code>{stats['entries']}</code>\n"
+        f"<b>sɪᴢᴇ :</b> <code>{convert_bytes(stats['size']) or '0 B'} / {convert_bytes(stats['limit'])}</code>\n"
+        f"<b>ᴘᴏʟɪᴄʏ :</b> <code>{stats['policy']}</code>\n"
+        f"<b>ʜɪᴛs :</b> <code>{stats['hits']}</code>\n"
+        f"<b>ᴍɪssᴇs :</b> <code>{stats['misses']}</code>\n"
+        f"<b>ᴇᴠɪᴄᴛɪᴏɴs :</b> <code>{stats['evictions']}</code>\n"
+        f"<b>ʜɪᴛ ʀᴀᴛᴇ :</b> <code>{stats['hit_rate']}%</code>\n\n"
+    )
+    stats = http_client.stats()
+    text += (
+        "<b><u>ʜᴛᴛᴘ ᴘᴏᴏʟ :</u></b>\n\n"
+        f"<b>ʀᴇǫᴜᴇsᴛs :</b> <code>{stats['requests']}</code>\n"
+        f"<b>ɴᴇᴡ ᴄᴏɴɴᴇᴄᴛɪᴏɴs :</b> <code>{stats['created']}</code>\n"
+        f"<b>ʀᴇᴜsᴇᴅ ᴄᴏɴɴᴇᴄᴛɪᴏɴs :</b> <code>{stats['reused']}</code>\n"
+        f"<b>ʀᴇᴜsᴇ ʀᴀᴛᴇ :</b> <code>{stats['reuse_rate']}%</code>\n"
+        f"<b>ᴅɴs ᴄᴀᴄʜᴇ :</b> <code>{stats['dns_hits']} ʜɪᴛs / {stats['dns_misses']} ᴍɪssᴇs</code>\n\n"
+    )
+    stats = tg_index_stats
+    lookups = stats["hits"] + stats["misses"]
+    text += (
+        "<b><u>ᴛᴇʟᴇɢʀᴀᴍ ɪɴᴅᴇx :</u></b>\n\n"
+        f"<b>ʜɪᴛs :</b> <code>{stats['hits']}</code>\n"
+        f"<b>ᴍɪssᴇs :</b> <code>{stats['misses']}</code>\n"
+        f"<b>ɪɴᴠᴀʟɪᴅᴀᴛɪᴏɴs :</b> <code>{stats['invalidations']}</code>\n"
+        f"<b>ʜɪᴛ ʀᴀᴛᴇ :</b> <code>{round(stats['hits'] * 100 / lookups, 2) if lookups else 0}%</code>\n\n"
+    )
+    stats = track_info.stats()
+    text += (
+        "<b><u>ᴛʀᴀᴄᴋ ɪɴғᴏ :</u></b>\n\n"
+        f"<b>ᴇɴᴛʀɪᴇs :</b> <code>{stats['entries']} / {stats['maxsize']}</code>\n"
+        f"<b>ʜɪᴛ ʀᴀᴛᴇ :</b> <code>{stats['hit_rate']}%</code>\n"
+        f"<b>ᴍᴏɴɢᴏ ʜɪᴛs :</b> <code>{stats['mongo_hits']}</code>\n"
+        f"<b>sᴇᴀʀᴄʜᴇs :</b> <code>{stats['searches']}</code>\n"
+        f"<b>sʟɪᴅᴇʀ ᴘᴀɢᴇs :</b> <code>{stats['pages']['entries']} ({stats['pages']['hit_rate']}% ʜɪᴛs)</code>\n\n"
+    )
+    stats = track_matches.stats()
+    text += (
+        "<b><u>ᴛʀᴀᴄᴋ ᴍᴀᴛᴄʜᴇs :</u></b>\n\n"
+        f"<b>ʟᴏᴀᴅᴇᴅ :</b> <code>{stats['entries']}</code>\n"
+        f"<b>ᴍᴀᴛᴄʜᴇᴅ :</b> <code>{stats['hits']}</code>\n"
+        f"<b>sᴇᴀʀᴄʜᴇᴅ :</b> <code>{stats['misses']}</code>\n"
+        f"<b>ʜɪᴛ ʀᴀᴛᴇ :</b> <code>{stats['hit_rate']}%</code>\n\n"
+    )
+    text += "<b><u>ᴀᴘɪ ᴇɴᴅᴘᴏɪɴᴛs :</u></b>\n\n"
+    for url, state in api_endpoints.stats().items():
+        latency = {
+            key: f"{round(state[key] * 1000)}ms" if state[key] is not None else "-"
+            for key in ("latency", "p50", "p95")
+        }
+        buckets = " ".join(
+            f"{label}:{count}" for label, count in state["buckets"].items() if count
+        )
+        text += (
+            f"<code>{url}</code>\n"
+            f"<b>sᴛᴀᴛᴇ :</b> <code>{state['state']}</code> | "
+            f"<b>ᴏᴋ :</b> <code>{state['successes']}</code> | "
+            f"<b>ᴇʀʀᴏʀs :</b> <code>{state['errors']}</code>\n"
+            f"<b>ʟᴀᴛᴇɴᴄʏ :</b> <code>{latency['latency']}</code> | "
+            f"<b>ᴘ50 :</b> <code>{latency['p50']}</code> | "
+            f"<b>ᴘ95 :</b> <code>{latency['p95']}</code>\n"
+        )
+        if buckets:
+            text += f"<code>{buckets}</code>\n"
+    text += "\n<b><u>ᴅᴏᴡɴʟᴏᴀᴅ ʙᴀᴄᴋᴇɴᴅs :</u></b>\n\n"
+    for backend in backends:
+        state = backend.stats()
+        throughput = (
+            f"{convert_bytes(state['throughput'])}/s" if state["throughput"] else "-"
+        )
+        text += (
+            f"<b>{backend.name} :</b> <code>{state['state']}</code> | "
+            f"<b>ᴏᴋ :</b> <code>{state['successes']}</code> | "
+            f"<b>ᴇʀʀᴏʀs :</b> <code>{state['failures']}</code> | "
+            f"<b>sᴘᴇᴇᴅ :</b> <code>{throughput}</code>\n"
+        )
+    for title, pool in (("ᴡᴏʀᴋᴇʀ ᴘᴏᴏʟ", worker_pool), ("ᴅᴏᴡɴʟᴏᴀᴅ ᴘᴏᴏʟ", download_pool)):
+        stats = pool.stats()
+        text += (
+            f"\n<b><u>{title} :</u></b>\n\n"
+            f"<b>ᴘʀᴏᴄᴇssᴇs :</b> <code>{stats['size']}</code>\n"
+            f"<b>ʀᴜɴɴɪɴɢ :</b> <code>{stats['running']}</code>\n"
+            f"<b>ᴊᴏʙs :</b> <code>{stats['submitted']}</code>\n"
+            f"<b>ғᴀɪʟᴇᴅ :</b> <code>{stats['failed']}</code>\n"
+        )
+    await message.reply_text(text)
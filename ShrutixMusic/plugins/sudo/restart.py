@@ -18,6 +18,7 @@ from ShrutixMusic.utils.database import (
     remove_active_video_chat,
 )
 from ShrutixMusic.utils.decorators.language import language
+from ShrutixMusic.utils.mediacache import media_cache
 from ShrutixMusic.utils.pastebin import ShrutiBin
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -106,6 +107,7 @@ async def update_(client, message, _):
             )
     else:
         os.system("pip3 install -r requirements.txt")
+        media_cache.flush()
         os.system(f"kill -9 {os.getpid()} && bash start")
         exit()
 
@@ -125,8 +127,9 @@ async def restart_(_, message):
         except:
             pass
 
+    media_cache.flush()
+    media_cache.clean_untracked()
     try:
-        shutil.rmtree("downloads")
         shutil.rmtree("raw_files")
         shutil.rmtree("cache")
     except:
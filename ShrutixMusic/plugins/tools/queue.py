@@ -12,14 +12,17 @@ from ShrutixMusic.utils import ShrutiBin, get_channeplayCB, seconds_to_min
 from ShrutixMusic.utils.database import get_cmode, is_active_chat, is_music_playing
 from ShrutixMusic.utils.decorators.language import language, languageCB
 from ShrutixMusic.utils.inline import queue_back_markup, queue_markup
+from ShrutixMusic.utils.thumbnails import card_file_id, thumb_path
 from config import BANNED_USERS
 
 basic = {}
 
 
 def get_image(videoid):
-    if os.path.isfile(f"cache/{videoid}.png"):
-        return f"cache/{videoid}.png"
+    if card_file_id(videoid):
+        return card_file_id(videoid)
+    if os.path.isfile(thumb_path(videoid)):
+        return thumb_path(videoid)
     else:
         return config.YOUTUBE_IMG_URL
 
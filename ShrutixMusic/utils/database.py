@@ -1,4 +1,5 @@
 import random
+import time
 from typing import Dict, List, Union
 
 from ShrutixMusic import userbot
@@ -20,6 +21,11 @@ playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
 skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
+tgfilesdb = mongodb.tgfiles
+apidb = mongodb.apiendpoints
+trackinfodb = mongodb.trackinfo
+trackmatchdb = mongodb.trackmatches
+cardsdb = mongodb.thumbcards
 usersdb = mongodb.tgusersdb
 
 # Shifting to memory [mongo sucks often]
@@ -644,3 +650,88 @@ async def remove_banned_user(user_id: int):
     if not is_gbanned:
         return
     return await blockeddb.delete_one({"user_id": user_id})
+
+
+async def get_tg_file(video_id: str, file_type: str) -> Union[bool, dict]:
+    _file = await tgfilesdb.find_one({"video_id": video_id, "type": file_type})
+    if not _file:
+        return False
+    return _file
+
+
+async def save_tg_file(video_id: str, file_type: str, link: str, file_id: str):
+    await tgfilesdb.update_one(
+        {"video_id": video_id, "type": file_type},
+        {"$set": {"link": link, "file_id": file_id}},
+        upsert=True,
+    )
+
+
+async def delete_tg_file(video_id: str, file_type: str):
+    await tgfilesdb.delete_one({"video_id": video_id, "type": file_type})
+
+
+async def get_api_endpoints() -> Union[bool, dict]:
+    endpoints = await apidb.find_one({"api": "download"})
+    if not endpoints:
+        return False
+    return endpoints
+
+
+async def save_api_endpoints(urls: List[str], last_good: str):
+    await apidb.update_one(
+        {"api": "download"},
+        {"$set": {"urls": urls, "last_good": last_good}},
+        upsert=True,
+    )
+
+
+async def get_track_info(video_id: str) -> Union[bool, dict]:
+    info = await trackinfodb.find_one({"video_id": video_id})
+    if not info:
+        return False
+    return info
+
+
+async def save_track_info(video_id: str, info: dict):
+    await trackinfodb.update_one(
+        {"video_id": video_id},
+        {"$set": {"info": info, "cached": time.time()}},
+        upsert=True,
+    )
+
+
+async def get_track_matches(source: str, source_ids: List[str]) -> list:
+    matches = []
+    async for match in trackmatchdb.find(
+        {"source": source, "source_id": {"$in": source_ids}}
+    ):
+        matches.append(match)
+    return matches
+
+
+async def get_card_file(bot_id: int, video_id: str) -> Union[bool, str]:
+    card = await cardsdb.find_one({"bot_id": bot_id, "video_id": video_id})
+    if not card:
+        return False
+    return card["file_id"]
+
+
+async def delete_card_file(bot_id: int, video_id: str):
+    await cardsdb.delete_one({"bot_id": bot_id, "video_id": video_id})
+
+
+async def save_card_file(bot_id: int, video_id: str, file_id: str):
+    await cardsdb.update_one(
+        {"bot_id": bot_id, "video_id": video_id},
+        {"$set": {"file_id": file_id}},
+        upsert=True,
+    )
+
+
+async def save_track_match(source: str, source_id: str, info: dict):
+    await trackmatchdb.update_one(
+        {"source": source, "source_id": source_id},
+        {"$set": {"vidid": info["id"], "info": info}},
+        upsert=True,
+    )
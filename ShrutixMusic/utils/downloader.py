@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+import aiofiles
+import aiohttp
+
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.utils.formatters import check_duration
+from ShrutixMusic.utils.resilience import backoff
+
+CHUNK_SIZE = 1 << 16
+BUFFER_SIZE = 1 << 20
+RETRIES = 3
+# Seconds without any data before a transfer is treated as stalled and resumed.
+STALL_TIMEOUT = 30
+
+
+def _total_size(response, offset):
+    content_range = response.headers.get("Content-Range")
+    if content_range and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        if total.isdigit():
+            return int(total)
+    if response.content_length is not None:
+        return offset + response.content_length
+    return None
+
+
+async def _is_playable(file_path) -> bool:
+    try:
+        duration = await asyncio.get_running_loop().run_in_executor(
+            None, check_duration, file_path
+        )
+    except Exception:
+        return False
+    return isinstance(duration, float) and duration > 0
+
+
+async def download_file(url: str, file_path: str, timeout: int = 300):
+    """
+    Downloads url into a temporary file next to file_path and only moves it
+    into place once it is complete, resuming with a Range request if the
+    transfer breaks. Returns file_path, or None if the download failed.
+    """
+    logger = LOGGER(__name__)
+    temp = f"{file_path}.part"
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    total = None
+    offset = 0
+    complete = False
+    try:
+        os.remove(temp)
+    except OSError:
+        pass
+    for attempt in range(1, RETRIES + 1):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            async with http_client.session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=remaining, sock_read=min(remaining, STALL_TIMEOUT)
+                ),
+            ) as response:
+                if response.status == 200:
+                    offset = 0
+                elif response.status != 206:
+                    logger.error(f"Download failed with HTTP {response.status}: {file_path}")
+                    break
+                total = _total_size(response, offset)
+                async with aiofiles.open(temp, "ab" if offset else "wb") as f:
+                    buffer = bytearray()
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        buffer += chunk
+                        if len(buffer) >= BUFFER_SIZE:
+                            await f.write(bytes(buffer))
+                            offset += len(buffer)
+                            buffer.clear()
+                    if buffer:
+                        await f.write(bytes(buffer))
+                        offset += len(buffer)
+            if total is None or offset >= total:
+                complete = True
+                break
+            logger.warning(f"Download ended early at {offset}/{total} bytes: {file_path}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Download interrupted at {offset} bytes ({attempt}/{RETRIES}): {e}")
+        try:
+            offset = os.path.getsize(temp)
+        except OSError:
+            offset = 0
+        await asyncio.sleep(backoff(attempt))
+
+    try:
+        size = os.path.getsize(temp)
+    except OSError:
+        size = 0
+    valid = (
+        complete
+        and size > 0
+        and (size == total if total else await _is_playable(temp))
+    )
+    if not valid:
+        logger.error(f"Discarding incomplete download ({size}/{total} bytes): {file_path}")
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        return None
+    os.replace(temp, file_path)
+    return file_path
@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+import config
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.utils.database import get_api_endpoints, save_api_endpoints
+from ShrutixMusic.utils.resilience import CircuitBreaker, LatencyHistogram
+
+
+class EndpointRegistry:
+    """
+    Download API base urls with health tracking. Endpoints are ordered by
+    their recent latency, each has a circuit breaker so requests fail over
+    past broken ones, and the list is refreshed in the background.
+    """
+
+    def __init__(self):
+        self.source = config.API_URL_SOURCE
+        self.ttl = config.API_URL_TTL
+        self.endpoints = {}
+        self.last_good = None
+        self.refreshed = 0
+        self._task = None
+        for url in config.API_URLS:
+            self._add(url)
+
+    def _add(self, url: str):
+        url = url.strip().rstrip("/")
+        if url and url not in self.endpoints:
+            self.endpoints[url] = {
+                "latency": None,
+                "successes": 0,
+                "errors": 0,
+                "breaker": CircuitBreaker(),
+                "histogram": LatencyHistogram(),
+            }
+
+    async def start(self):
+        try:
+            saved = await get_api_endpoints()
+        except Exception as e:
+            saved = None
+            LOGGER(__name__).warning(f"Failed to load saved API urls: {e}")
+        if saved:
+            for url in saved.get("urls", []):
+                self._add(url)
+            self.last_good = saved.get("last_good")
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresher())
+
+    async def _refresher(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.ttl)
+
+    async def refresh(self) -> bool:
+        if not self.source:
+            return False
+        try:
+            async with http_client.session.get(self.source) as response:
+                if response.status != 200:
+                    LOGGER(__name__).error(
+                        f"Failed to fetch API URL. HTTP Status: {response.status}"
+                    )
+                    return False
+                content = await response.text()
+        except Exception as e:
+            LOGGER(__name__).error(f"Error loading API URL: {e}")
+            return False
+        for url in content.split():
+            self._add(url)
+        self.refreshed = time.time()
+        LOGGER(__name__).info("API URL loaded successfully")
+        await self._save()
+        return True
+
+    async def _save(self):
+        try:
+            await save_api_endpoints(list(self.endpoints), self.last_good)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to save API urls: {e}")
+
+    def candidates(self) -> list:
+        """Endpoints whose breaker would let a call through, fastest first."""
+
+        def rank(url):
+            latency = self.endpoints[url]["latency"]
+            if latency is None:
+                latency = 0 if url == self.last_good else float("inf")
+            return latency
+
+        return [
+            url
+            for url in sorted(self.endpoints, key=rank)
+            if self.endpoints[url]["breaker"].usable
+        ]
+
+    def claim(self, url: str) -> bool:
+        """Called right before a request goes to url, takes the half-open trial if any."""
+        state = self.endpoints.get(url)
+        return state is not None and state["breaker"].allow()
+
+    def release(self, url: str):
+        """Gives back the trial of a request to url that was cancelled before it finished."""
+        state = self.endpoints.get(url)
+        if state is not None:
+            state["breaker"].release()
+
+    def available(self) -> bool:
+        """Whether candidates() would list an endpoint, or the list can still be fetched."""
+        if not self.endpoints:
+            return bool(self.source)
+        return any(state["breaker"].usable for state in self.endpoints.values())
+
+    def hedge_delay(self, url: str) -> float:
+        """How long a call to url may run before a duplicate goes to the next endpoint."""
+        histogram = self.endpoints[url]["histogram"]
+        if len(histogram.samples) < 20:
+            return config.HEDGE_DELAY
+        return max(0.5, histogram.percentile(95))
+
+    def record(self, url: str, ok: bool, latency: float = None):
+        state = self.endpoints.get(url)
+        if state is None:
+            return
+        if ok:
+            state["successes"] += 1
+            state["breaker"].success()
+            if latency is not None:
+                state["histogram"].observe(latency)
+                state["latency"] = (
+                    latency
+                    if state["latency"] is None
+                    else state["latency"] * 0.8 + latency * 0.2
+                )
+            if self.last_good != url:
+                self.last_good = url
+                asyncio.ensure_future(self._save())
+        else:
+            state["errors"] += 1
+            state["breaker"].failure()
+
+    def stats(self) -> dict:
+        return {
+            url: {
+                "latency": state["latency"],
+                "successes": state["successes"],
+                "errors": state["errors"],
+                "state": state["breaker"].state,
+                **state["histogram"].snapshot(),
+            }
+            for url, state in self.endpoints.items()
+        }
+
+
+api_endpoints = EndpointRegistry()
@@ -0,0 +1,190 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import config
+from ShrutixMusic.logging import LOGGER
+from config import autoclean
+
+# Seconds between writes of hit counters and access times, get() only keeps them in memory
+FLUSH_INTERVAL = 60
+
+
+class MediaCache:
+    """
+    Byte budgeted cache for downloaded tracks, indexed on disk so that
+    replays survive restarts. Tracks still queued somewhere are never evicted.
+    """
+
+    def __init__(self, directory: str = "downloads"):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.limit = config.CACHE_SIZE_LIMIT
+        self.policy = "lfu" if config.CACHE_EVICTION_POLICY == "lfu" else "lru"
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dirty = False
+        self._sequence = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        self._task = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        for path, entry in data.get("entries", {}).items():
+            if os.path.isfile(path):
+                self.entries[path] = entry
+        counters = data.get("stats", {})
+        self.hits = counters.get("hits", 0)
+        self.misses = counters.get("misses", 0)
+        self.evictions = counters.get("evictions", 0)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flusher())
+
+    async def _flusher(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if self.dirty:
+                self.dirty = False
+                sequence, text = self._dump()
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._write, sequence, text
+                )
+
+    def flush(self):
+        """Writes pending counters right away, used before shutting down."""
+        if self.dirty:
+            self._save()
+
+    def _dump(self):
+        data = {
+            "entries": self.entries,
+            "stats": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            },
+        }
+        self._sequence += 1
+        return self._sequence, json.dumps(data)
+
+    def _write(self, sequence: int, text: str):
+        # A flush finishing late must not replace a newer index
+        with self._lock:
+            if sequence < self._written:
+                return
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                temp = f"{self.index_path}.tmp"
+                with open(temp, "w") as f:
+                    f.write(text)
+                os.replace(temp, self.index_path)
+                self._written = sequence
+            except OSError as e:
+                LOGGER(__name__).warning(f"Failed to save media cache index: {e}")
+
+    def _save(self):
+        self.dirty = False
+        self._write(*self._dump())
+
+    def contains(self, path: str) -> bool:
+        return path in self.entries
+
+    def usage(self) -> int:
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def get(self, path: str):
+        entry = self.entries.get(path)
+        if entry and os.path.isfile(path):
+            entry["atime"] = time.time()
+            entry["hits"] += 1
+            self.hits += 1
+            self.dirty = True
+            return path
+        self.misses += 1
+        if entry:
+            self.entries.pop(path, None)
+            self._save()
+        else:
+            self.dirty = True
+        return None
+
+    def put(self, path: str):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        now = time.time()
+        self.entries[path] = {"size": size, "atime": now, "ctime": now, "hits": 0}
+        self._evict(keep=path)
+        self._save()
+
+    def discard(self, path: str):
+        if self.entries.pop(path, None) is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._save()
+
+    def _evict(self, keep: str = None):
+        total = self.usage()
+        if total <= self.limit:
+            return
+        if self.policy == "lfu":
+            key = lambda p: (self.entries[p]["hits"], self.entries[p]["atime"])
+        else:
+            key = lambda p: self.entries[p]["atime"]
+        candidates = sorted(
+            (p for p in self.entries if p != keep and p not in autoclean), key=key
+        )
+        for path in candidates:
+            if total <= self.limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= self.entries.pop(path)["size"]
+            self.evictions += 1
+
+    def clean_untracked(self):
+        """Removes leftover files from the downloads folder which the cache does not own."""
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path == self.index_path or path in self.entries:
+                continue
+            try:
+                if os.path.isfile(path):
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "size": self.usage(),
+            "limit": self.limit,
+            "policy": self.policy,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits * 100 / lookups, 2) if lookups else 0,
+        }
+
+
+media_cache = MediaCache()
@@ -0,0 +1,135 @@
+import asyncio
+import bisect
+import random
+import time
+from collections import deque
+
+import config
+
+BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+
+
+class LatencyHistogram:
+    """Bucketed latency counts plus a window of recent samples for percentiles."""
+
+    def __init__(self, window: int = 200):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.samples.append(seconds)
+
+    def percentile(self, p: float):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def snapshot(self) -> dict:
+        labels = [f"≤{b}s" for b in BUCKETS] + [f">{BUCKETS[-1]}s"]
+        return {
+            "count": sum(self.counts),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class CircuitBreaker:
+    """
+    Opens after threshold consecutive failures so the backend is skipped,
+    then lets a single trial call through once reset_timeout has passed.
+    """
+
+    def __init__(self, threshold: int = None, reset_timeout: int = None):
+        self.threshold = threshold or config.BREAKER_THRESHOLD
+        self.reset_timeout = reset_timeout or config.BREAKER_RESET_TIMEOUT
+        self.failures = 0
+        self.opened = 0
+        self.trial = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.threshold:
+            return "closed"
+        if time.time() - self.opened >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    @property
+    def usable(self) -> bool:
+        """Whether allow() would let a call through, without claiming the trial."""
+        state = self.state
+        return state == "closed" or (state == "half-open" and not self.trial)
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def release(self):
+        """Hands back a trial whose call ended without a result, e.g. when cancelled."""
+        self.trial = False
+
+    def success(self):
+        self.failures = 0
+        self.trial = False
+
+    def failure(self):
+        self.failures += 1
+        self.trial = False
+        if self.failures >= self.threshold:
+            self.opened = time.time()
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 5) -> float:
+    """Full jitter exponential backoff delay for the given retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+async def hedged(candidates: list, call, delay_for):
+    """
+    Calls the candidates in order and returns the first (True, result).
+    The next candidate is started early when the running calls take longer
+    than delay_for(candidate), or as soon as a call fails. call must return
+    (ok, result) instead of raising. Calls still running are cancelled and
+    waited for, so their cleanup is done before this returns.
+    """
+    queue = list(candidates)
+    pending = set()
+    last = None
+
+    def launch():
+        nonlocal last
+        last = queue.pop(0)
+        pending.add(asyncio.ensure_future(call(last)))
+
+    try:
+        if queue:
+            launch()
+        while pending:
+            timeout = delay_for(last) if queue else None
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                launch()
+                continue
+            for task in done:
+                pending.discard(task)
+                ok, result = task.result()
+                if ok:
+                    return True, result
+            if queue and not pending:
+                launch()
+        return False, None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
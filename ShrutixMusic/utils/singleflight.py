@@ -0,0 +1,36 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key, concurrent callers of the same key await
+    the running call and share its result. The call is cancelled only once
+    every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self):
+        self.flights = {}
+
+    def inflight(self, key) -> bool:
+        return key in self.flights
+
+    async def do(self, key, func, *args, **kwargs):
+        flight = self.flights.get(key)
+        if flight is None:
+            flight = {"task": asyncio.ensure_future(func(*args, **kwargs)), "waiters": 0}
+            self.flights[key] = flight
+            flight["task"].add_done_callback(lambda _: self._land(key, flight))
+        task = flight["task"]
+        flight["waiters"] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if flight["waiters"] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            flight["waiters"] -= 1
+
+    def _land(self, key, flight):
+        if self.flights.get(key) is flight:
+            del self.flights[key]
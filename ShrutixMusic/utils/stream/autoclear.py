@@ -1,5 +1,6 @@
 import os
 
+from ShrutixMusic.utils.mediacache import media_cache
 from config import autoclean
 
 
@@ -9,6 +10,8 @@ async def auto_clean(popped):
         autoclean.remove(rem)
         count = autoclean.count(rem)
         if count == 0:
+            if media_cache.contains(rem):
+                return
             if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
                 try:
                     os.remove(rem)
@@ -0,0 +1,67 @@
+import asyncio
+
+import config
+from ShrutixMusic import YouTube
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.misc import db
+
+
+class Prefetcher:
+    """
+    Downloads the next few queued tracks of every chat in the background so
+    that track changes find them in the media cache.
+    """
+
+    def __init__(self):
+        self.ahead = config.PREFETCH_AHEAD
+        self.semaphore = asyncio.Semaphore(max(config.PREFETCH_CONCURRENCY, 1))
+        self.tasks = {}
+
+    def schedule(self, chat_id: int):
+        queue = db.get(chat_id) or []
+        wanted = set()
+        # The head is kept in the window so a track that just moved up is not cancelled
+        # right before the player asks for it.
+        for entry in queue[: self.ahead + 1]:
+            if "vid_" in str(entry.get("file")):
+                wanted.add((entry["vidid"], entry["streamtype"]))
+        running = self.tasks.setdefault(chat_id, {})
+        for key in list(running):
+            if key not in wanted:
+                running.pop(key).cancel()
+        for key in wanted:
+            if key not in running:
+                task = asyncio.create_task(self._fetch(*key))
+                running[key] = task
+                task.add_done_callback(
+                    lambda done, key=key: self._done(chat_id, key, done)
+                )
+        if not running:
+            self.tasks.pop(chat_id, None)
+
+    def cancel(self, chat_id: int):
+        for task in self.tasks.pop(chat_id, {}).values():
+            task.cancel()
+
+    def _done(self, chat_id, key, task):
+        running = self.tasks.get(chat_id)
+        if running and running.get(key) is task:
+            del running[key]
+            if not running:
+                self.tasks.pop(chat_id, None)
+
+    async def _fetch(self, vidid, streamtype):
+        async with self.semaphore:
+            try:
+                await YouTube.download(
+                    vidid,
+                    None,
+                    videoid=True,
+                    video=True if str(streamtype) == "video" else None,
+                    stream=False,
+                )
+            except Exception as e:
+                LOGGER(__name__).warning(f"Prefetch failed for {vidid}: {e}")
+
+
+prefetcher = Prefetcher()
@@ -3,6 +3,7 @@ from typing import Union
 
 from ShrutixMusic.misc import db
 from ShrutixMusic.utils.formatters import check_duration, seconds_to_min
+from ShrutixMusic.utils.stream.prefetch import prefetcher
 from config import autoclean, time_to_seconds
 
 
@@ -45,6 +46,7 @@ async def put_queue(
     else:
         db[chat_id].append(put)
     autoclean.append(file)
+    prefetcher.schedule(chat_id)
 
 
 async def put_queue_index(
@@ -0,0 +1,53 @@
+import asyncio
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def resolve_in_order(items, func, concurrency: int):
+    """
+    Runs func over items with at most concurrency calls in flight and yields
+    (item, result) in the original order as soon as each one is ready. A
+    failed call yields its exception as the result. items may also be an
+    async iterator that is still producing. Calls the caller never reaches
+    are cancelled once iteration stops, so wrap it in aclosing().
+    """
+    if not hasattr(items, "__aiter__"):
+        items = _aiter(items)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    ready = asyncio.Queue()
+
+    async def call(item):
+        try:
+            return await func(item)
+        except Exception as e:
+            return e
+
+    async def feed():
+        try:
+            async for item in items:
+                await slots.acquire()
+                ready.put_nowait((item, asyncio.ensure_future(call(item))))
+        except Exception:
+            pass
+        finally:
+            ready.put_nowait(None)
+
+    feeder = asyncio.ensure_future(feed())
+    try:
+        while True:
+            entry = await ready.get()
+            if entry is None:
+                break
+            item, task = entry
+            result = await task
+            slots.release()
+            yield item, result
+    finally:
+        feeder.cancel()
+        while not ready.empty():
+            entry = ready.get_nowait()
+            if entry is not None:
+                entry[1].cancel()
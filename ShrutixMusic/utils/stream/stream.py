@@ -1,5 +1,5 @@
 import os
-from random import randint
+from contextlib import aclosing
 from typing import Union
 
 from pyrogram.types import InlineKeyboardMarkup
@@ -13,7 +13,9 @@ from ShrutixMusic.utils.exceptions import AssistantErr
 from ShrutixMusic.utils.inline import aq_markup, close_markup, stream_markup
 from ShrutixMusic.utils.pastebin import ShrutiBin
 from ShrutixMusic.utils.stream.queue import put_queue, put_queue_index
-from ShrutixMusic.utils.thumbnails import get_thumb
+from ShrutixMusic.utils.stream.resolver import resolve_in_order
+from ShrutixMusic.utils.thumbnails import get_thumb, send_card
+from ShrutixMusic.utils.trackmatch import track_matches
 
 
 async def stream(
@@ -36,83 +38,100 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
-            if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
-            try:
+        if spotify:
+            # One read for the whole playlist, only unmatched tracks get searched
+            await track_matches.preload(result)
+
+        async def lookup(search):
+            if spotify:
+                info = await track_matches.resolve(search)
+                if not info:
+                    raise ValueError(f"No results found for {search}")
+                search = info["id"]
+            return await YouTube.details(search, True)
+
+        lookups = resolve_in_order(
+            result, lookup, config.PLAYLIST_RESOLVE_CONCURRENCY
+        )
+        async with aclosing(lookups):
+            async for search, details in lookups:
+                if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                    break
+                if isinstance(details, Exception):
+                    continue
                 (
                     title,
                     duration_min,
                     duration_sec,
                     thumbnail,
                     vidid,
-                ) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
-            if str(duration_min) == "None":
-                continue
-            if duration_sec > config.DURATION_LIMIT:
-                continue
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}. {title[:70]}\n"
-                msg += f"{_['play_20']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
-                try:
-                    file_path, direct = await YouTube.download(
-                        vidid, mystic, video=status, videoid=True
+                ) = details
+                if str(duration_min) == "None":
+                    continue
+                if duration_sec > config.DURATION_LIMIT:
+                    continue
+                if await is_active_chat(chat_id):
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        f"vid_{vidid}",
+                        title,
+                        duration_min,
+                        user_name,
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
                     )
-                except:
-                    raise AssistantErr(_["play_14"])
-                await Shruti.join_call(
-                    chat_id,
-                    original_chat_id,
-                    file_path,
-                    video=status,
-                    image=thumbnail,
-                )
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    file_path if direct else f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                    forceplay=forceplay,
-                )
-                img = await get_thumb(vidid)
-                button = stream_markup(_, chat_id)
-                run = await nand.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        f"https://t.me/{nand.username}?start=info_{vidid}",
-                        title[:23],
+                    position = len(db.get(chat_id)) - 1
+                    count += 1
+                    msg += f"{count}. {title[:70]}\n"
+                    msg += f"{_['play_20']} {position}\n\n"
+                else:
+                    if not forceplay:
+                        db[chat_id] = []
+                    status = True if video else None
+                    try:
+                        file_path, direct = await YouTube.download(
+                            vidid, mystic, video=status, videoid=True
+                        )
+                    except:
+                        raise AssistantErr(_["play_14"])
+                    await Shruti.join_call(
+                        chat_id,
+                        original_chat_id,
+                        file_path,
+                        video=status,
+                        image=thumbnail,
+                    )
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        file_path if direct else f"vid_{vidid}",
+                        title,
                         duration_min,
                         user_name,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
+                        forceplay=forceplay,
+                    )
+                    img = await get_thumb(vidid)
+                    button = stream_markup(_, chat_id)
+                    run = await send_card(
+                        vidid,
+                        img,
+                        nand.send_photo,
+                        original_chat_id,
+                        caption=_["stream_1"].format(
+                            f"https://t.me/{nand.username}?start=info_{vidid}",
+                            title[:23],
+                            duration_min,
+                            user_name,
+                        ),
+                        reply_markup=InlineKeyboardMarkup(button),
+                    )
+                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["markup"] = "stream"
         if count == 0:
             return
         else:
@@ -122,7 +141,7 @@ async def stream(
                 car = os.linesep.join(msg.split(os.linesep)[:17])
             else:
                 car = msg
-            carbon = await Carbon.generate(car, randint(100, 10000000))
+            carbon = await Carbon.generate(car)
             upl = close_markup(_)
             return await nand.send_photo(
                 original_chat_id,
@@ -186,9 +205,11 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await nand.send_photo(
+            run = await send_card(
+                vidid,
+                img,
+                nand.send_photo,
                 original_chat_id,
-                photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{nand.username}?start=info_{vidid}",
                     title[:23],
@@ -354,9 +375,11 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await nand.send_photo(
+            run = await send_card(
+                vidid,
+                img,
+                nand.send_photo,
                 original_chat_id,
-                photo=img,
                 caption=_["stream_1"].format(
                     f"https://t.me/{nand.username}?start=info_{vidid}",
                     title[:23],
@@ -1,15 +1,30 @@
+import io
 import os
 import re
+import time
 
-import aiofiles
-import aiohttp
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from pyrogram.errors import BadRequest
 from unidecode import unidecode
-from py_yt import VideosSearch
 
+import config
 from ShrutixMusic import nand
+from ShrutixMusic.core.http import http_client
+from ShrutixMusic.core.workers import worker_pool
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.utils.database import delete_card_file, get_card_file, save_card_file
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.trackinfo import track_info
+from ShrutixMusic.utils.ttlcache import TTLCache
 from config import YOUTUBE_IMG_URL
 
+renders = SingleFlight()
+# Telegram file_ids of sent cards by video id, also kept in Mongo
+card_ids = TTLCache(5000, 86400)
+# Seconds a card file is kept after its file_id is known, sends that got the
+# path before that may still be uploading it
+CARD_FILE_GRACE = 600
+
 
 def changeImageSize(maxWidth, maxHeight, image):
     widthRatio = maxWidth / image.size[0]
@@ -29,63 +44,33 @@ def clear(text):
     return title.strip()
 
 
-async def get_thumb(videoid):
-    if os.path.isfile(f"cache/{videoid}.png"):
-        return f"cache/{videoid}.png"
+# Fonts and the static overlay of each worker process, built on first use
+FONTS = {}
+OVERLAYS = {}
+# Brightness halved, same as ImageEnhance.Brightness(0.5) but as a lookup table
+DIM = [value // 2 for value in range(256)] * 3
 
-    url = f"https://www.youtube.com/watch?v={videoid}"
-    try:
-        results = VideosSearch(url, limit=1)
-        for result in (await results.next())["result"]:
-            try:
-                title = result["title"]
-                title = re.sub("\W+", " ", title)
-                title = title.title()
-            except:
-                title = "Unsupported Title"
-            try:
-                duration = result["duration"]
-            except:
-                duration = "Unknown Mins"
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            try:
-                views = result["viewCount"]["short"]
-            except:
-                views = "Unknown Views"
-            try:
-                channel = result["channel"]["name"]
-            except:
-                channel = "Unknown Channel"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(thumbnail) as resp:
-                if resp.status == 200:
-                    f = await aiofiles.open(f"cache/thumb{videoid}.png", mode="wb")
-                    await f.write(await resp.read())
-                    await f.close()
-
-        youtube = Image.open(f"cache/thumb{videoid}.png")
-        image1 = changeImageSize(1280, 720, youtube)
-        image2 = image1.convert("RGBA")
-        background = image2.filter(filter=ImageFilter.BoxBlur(10))
-        enhancer = ImageEnhance.Brightness(background)
-        background = enhancer.enhance(0.5)
-        draw = ImageDraw.Draw(background)
-        arial = ImageFont.truetype("ShrutixMusic/assets/font2.ttf", 30)
-        font = ImageFont.truetype("ShrutixMusic/assets/font.ttf", 30)
-        draw.text((1110, 8), unidecode(nand.name), fill="white", font=arial)
-        draw.text(
-            (55, 560),
-            f"{channel} | {views[:23]}",
-            (255, 255, 255),
-            font=arial,
-        )
-        draw.text(
-            (57, 600),
-            clear(title),
-            (255, 255, 255),
-            font=font,
-        )
+
+def thumb_path(videoid):
+    extension = "webp" if config.THUMB_FORMAT == "webp" else "jpg"
+    return f"cache/{videoid}.{extension}"
+
+
+def get_font(name, size=30):
+    font = FONTS.get((name, size))
+    if font is None:
+        font = FONTS[(name, size)] = ImageFont.truetype(f"ShrutixMusic/assets/{name}", size)
+    return font
+
+
+def get_overlay(name):
+    """The parts of the card every track shares, drawn once per bot name."""
+    overlay = OVERLAYS.get(name)
+    if overlay is None:
+        arial = get_font("font2.ttf")
+        overlay = Image.new("RGBA", (1280, 720), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(overlay)
+        draw.text((1110, 8), unidecode(name), fill="white", font=arial)
         draw.line(
             [(55, 660), (1220, 660)],
             fill="white",
@@ -104,18 +89,157 @@ async def get_thumb(videoid):
             (255, 255, 255),
             font=arial,
         )
-        draw.text(
-            (1185, 685),
-            f"{duration[:23]}",
-            (255, 255, 255),
-            font=arial,
+        OVERLAYS[name] = overlay
+    return overlay
+
+
+def render_thumb(image, path, name, title, channel, views, duration):
+    """Draws the now playing card from the raw thumbnail bytes, runs in a worker process."""
+    youtube = Image.open(io.BytesIO(image))
+    background = changeImageSize(1280, 720, youtube.convert("RGB"))
+    background = background.filter(ImageFilter.BoxBlur(10)).point(DIM)
+    overlay = get_overlay(name)
+    background.paste(overlay, (0, 0), overlay)
+    draw = ImageDraw.Draw(background)
+    arial = get_font("font2.ttf")
+    draw.text(
+        (55, 560),
+        f"{channel} | {views[:23]}",
+        (255, 255, 255),
+        font=arial,
+    )
+    draw.text(
+        (57, 600),
+        clear(title),
+        (255, 255, 255),
+        font=get_font("font.ttf"),
+    )
+    draw.text(
+        (1185, 685),
+        f"{duration[:23]}",
+        (255, 255, 255),
+        font=arial,
+    )
+    # Written aside first so get_thumb never picks up a half written card
+    if config.THUMB_FORMAT == "webp":
+        background.save(f"{path}.tmp", format="WEBP", quality=config.THUMB_QUALITY, method=4)
+    else:
+        background.save(
+            f"{path}.tmp", format="JPEG", quality=config.THUMB_QUALITY, optimize=True
         )
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def card_file_id(videoid):
+    """The Telegram file_id of an already sent card, if this process knows one."""
+    return card_ids.get(videoid)
+
+
+async def save_card(videoid, img, message):
+    """
+    Remembers the file_id Telegram gave a freshly uploaded card so later
+    sends reuse it. The local file is left for sweep_card, other chats may
+    have been handed the same path and still be sending it.
+    """
+    if img != thumb_path(videoid) or not message or not message.photo:
+        return
+    card_ids.set(videoid, message.photo.file_id)
+    try:
+        await save_card_file(nand.id, videoid, message.photo.file_id)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Failed to save card file_id: {e}")
+
+
+def sweep_card(videoid):
+    """Removes the card file of a sent card once CARD_FILE_GRACE has passed."""
+    path = thumb_path(videoid)
+    try:
+        if time.time() - os.path.getmtime(path) > CARD_FILE_GRACE:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+async def forget_card(videoid):
+    """Drops a stored file_id Telegram no longer accepts, so the card is rendered again."""
+    card_ids.pop(videoid)
+    try:
+        await delete_card_file(nand.id, videoid)
+    except Exception as e:
+        LOGGER(__name__).warning(f"Failed to delete card file_id: {e}")
+
+
+async def send_card(videoid, img, send, *args, **kwargs):
+    """
+    Sends the card img from get_thumb through send, a send_photo or
+    reply_photo method, and remembers its file_id. When Telegram rejects a
+    stored file_id the card is rendered and uploaded once more, and when
+    the card file is gone by now the file_id it was uploaded as is sent.
+    """
+    try:
+        message = await send(*args, photo=img, **kwargs)
+    except Exception as e:
+        stored = card_file_id(videoid)
+        if img == thumb_path(videoid) and not os.path.isfile(img) and stored:
+            # Swept while this send waited, another chat uploaded it already
+            img = stored
+        elif isinstance(e, BadRequest) and img == stored:
+            LOGGER(__name__).warning(f"Stored card of {videoid} was rejected: {e}")
+            await forget_card(videoid)
+            img = await get_thumb(videoid)
+        else:
+            raise
+        message = await send(*args, photo=img, **kwargs)
+    await save_card(videoid, img, message)
+    return message
+
+
+async def get_thumb(videoid):
+    file_id = card_ids.get(videoid)
+    if file_id is None:
+        try:
+            file_id = await get_card_file(nand.id, videoid)
+        except Exception:
+            file_id = None
+        if file_id:
+            card_ids.set(videoid, file_id)
+    if file_id:
+        sweep_card(videoid)
+        return file_id
+    if os.path.isfile(thumb_path(videoid)):
+        return thumb_path(videoid)
+    # Concurrent requests for the same card wait for one render
+    return await renders.do(videoid, make_thumb, videoid)
+
+
+async def make_thumb(videoid):
+    url = f"https://www.youtube.com/watch?v={videoid}"
+    try:
+        info = await track_info.get(url)
         try:
-            os.remove(f"cache/thumb{videoid}.png")
+            title = re.sub("\W+", " ", info["title"]).title()
         except:
-            pass
-        background.save(f"cache/{videoid}.png")
-        return f"cache/{videoid}.png"
+            title = "Unsupported Title"
+        duration = info["duration"] or "Unknown Mins"
+        thumbnail = info["thumbnail"]
+        views = info["views"] or "Unknown Views"
+        channel = info["channel"] or "Unknown Channel"
+
+        async with http_client.session.get(thumbnail) as resp:
+            resp.raise_for_status()
+            image = await resp.read()
+
+        return await worker_pool.run(
+            render_thumb,
+            image,
+            thumb_path(videoid),
+            nand.name,
+            title,
+            channel,
+            views,
+            duration,
+        )
     except Exception as e:
         print(e)
         return YOUTUBE_IMG_URL
@@ -0,0 +1,129 @@
+import re
+import time
+
+from py_yt import VideosSearch
+
+import config
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.utils.database import get_track_info, save_track_info
+from ShrutixMusic.utils.singleflight import SingleFlight
+from ShrutixMusic.utils.ttlcache import TTLCache
+
+VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|live/)([\w-]{11})")
+
+
+def _record(result: dict) -> dict:
+    channel = result.get("channel") or {}
+    return {
+        "id": result["id"],
+        "title": result["title"],
+        "duration": result.get("duration"),
+        "thumbnail": result["thumbnails"][0]["url"].split("?")[0],
+        "link": result["link"],
+        "channel": channel.get("name"),
+        "channel_link": channel.get("link"),
+        "views": (result.get("viewCount") or {}).get("short"),
+        "published": result.get("publishedTime"),
+    }
+
+
+class TrackInfoCache:
+    """
+    One metadata record per YouTube video id, shared by every lookup of that
+    video. Records live in a TTL and size bounded memory cache, optionally
+    backed by Mongo, and a search is only run on a miss in both.
+    """
+
+    def __init__(self):
+        self.cache = TTLCache(config.TRACKINFO_CACHE_SIZE, config.TRACKINFO_CACHE_TTL)
+        self.results = TTLCache(config.SEARCH_CACHE_SIZE, config.SEARCH_CACHE_TTL)
+        self.searches = SingleFlight()
+        self.mongo_hits = 0
+        self.lookups = 0
+
+    @staticmethod
+    def key(link: str) -> str:
+        match = VIDEO_ID.search(link)
+        if match:
+            return match.group(1)
+        return f"q:{' '.join(link.lower().split())}"
+
+    def remember(self, info: dict):
+        self.cache.set(info["id"], info)
+
+    async def get(self, link: str):
+        """The record for a video link, id url or search query, None if nothing matched."""
+        key = self.key(link)
+        info = self.cache.get(key)
+        if info is None:
+            info = await self.searches.do(key, self._load, key, link)
+        return info
+
+    async def _load(self, key: str, link: str):
+        if config.TRACKINFO_MONGO and not key.startswith("q:"):
+            try:
+                saved = await get_track_info(key)
+            except Exception as e:
+                saved = None
+                LOGGER(__name__).warning(f"Failed to read track info: {e}")
+            if saved and saved["cached"] + config.TRACKINFO_MONGO_TTL > time.time():
+                self.mongo_hits += 1
+                self.remember(saved["info"])
+                return saved["info"]
+        self.lookups += 1
+        results = (await VideosSearch(link, limit=1).next()).get("result")
+        if not results:
+            return None
+        info = _record(results[0])
+        self.remember(info)
+        if key.startswith("q:"):
+            self.cache.set(key, info)
+        await self._save(info)
+        return info
+
+    async def search(self, query: str, limit: int = 10, alias: str = None) -> list:
+        """
+        Records for the first limit results of a search, each remembered by
+        id. The list is kept briefly under the query, and also stored under
+        alias when given, so that paging through it does not search again.
+        Lookups always use the full query, alias is never read here.
+        """
+        key = ("search", self.key(query), limit)
+        results = self.results.get(key)
+        if results is None:
+            results = await self.searches.do(key, self._search, key, query, limit)
+        if alias and results:
+            self.results.set(("search", self.key(alias), limit), results)
+        return results
+
+    async def _search(self, key, query: str, limit: int) -> list:
+        self.lookups += 1
+        results = [
+            _record(result)
+            for result in (await VideosSearch(query, limit=limit).next()).get("result")
+            or []
+        ]
+        for info in results:
+            self.remember(info)
+        if results:
+            self.results.set(key, results)
+        return results
+
+    async def _save(self, info: dict):
+        if not config.TRACKINFO_MONGO:
+            return
+        try:
+            await save_track_info(info["id"], info)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to save track info: {e}")
+
+    def stats(self) -> dict:
+        return {
+            **self.cache.stats(),
+            "pages": self.results.stats(),
+            "mongo_hits": self.mongo_hits,
+            "searches": self.lookups,
+        }
+
+
+track_info = TrackInfoCache()
@@ -0,0 +1,127 @@
+import re
+
+from ShrutixMusic.logging import LOGGER
+from ShrutixMusic.utils.database import get_track_matches, save_track_match
+from ShrutixMusic.utils.trackinfo import track_info
+from ShrutixMusic.utils.ttlcache import TTLCache
+
+
+# Bracketed words that make a different recording of the song, kept in the key
+VERSIONS = re.compile(
+    r"\b(remix|mix|live|acoustic|unplugged|remaster(ed)?|edit|version|cover|"
+    r"instrumental|karaoke|slowed|reverb|sped|lofi|lo-fi|extended|demo|mashup)\b"
+)
+
+
+def _extra(match) -> str:
+    return match.group(0) if VERSIONS.search(match.group(0)) else " "
+
+
+def normalize(title: str) -> str:
+    """
+    Lowercased title without punctuation and bracketed extras, for matching
+    the same song. Version qualifiers like "(Remix)" or "[Live]" are kept.
+    """
+    title = re.sub(r"[\(\[].*?[\)\]]", _extra, title.lower())
+    title = re.sub(r"\b(feat|ft)\b\.?", " ", title)
+    return " ".join(re.sub(r"[^\w\s]", " ", title).split())
+
+
+class TrackMatchIndex:
+    """
+    Remembers which YouTube video a Spotify, Apple or Resso track was matched
+    to, keyed by the source track id and by its normalized title, so a track
+    is searched on YouTube only the first time anyone plays it.
+    """
+
+    def __init__(self):
+        self.cache = TTLCache(5000, 86400)
+        self.hits = 0
+        self.misses = 0
+
+    def _keys(self, query: str, source: str = None, source_id: str = None) -> list:
+        keys = [(source, source_id)] if source and source_id else []
+        title = normalize(query)
+        if title:
+            keys.append(("title", title))
+        return keys
+
+    async def _fetch(self, keys: list):
+        """Loads keys missing from memory with one Mongo query per source."""
+        wanted = {}
+        for source, source_id in keys:
+            if (source, source_id) not in self.cache:
+                wanted.setdefault(source, []).append(source_id)
+        for source, source_ids in wanted.items():
+            try:
+                matches = await get_track_matches(source, source_ids)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Failed to read track matches: {e}")
+                continue
+            found = {match["source_id"]: match["info"] for match in matches}
+            # Unmatched ids are remembered as False for a while so resolve() does not ask again
+            for source_id in source_ids:
+                if source_id in found:
+                    self.cache.set((source, source_id), found[source_id])
+                else:
+                    self.cache.set((source, source_id), False, ttl=600)
+
+    async def preload(self, queries: list, source: str = None, source_ids: list = None):
+        """Bulk loads the matches of a whole playlist so resolving it needs no further reads."""
+        keys = []
+        for position, query in enumerate(queries):
+            source_id = source_ids[position] if source_ids else None
+            keys.extend(self._keys(query, source, source_id))
+        await self._fetch(keys)
+
+    async def resolve(self, query: str, source: str = None, source_id: str = None):
+        """The YouTube track info for a source track, searching YouTube only when unmatched."""
+        keys = self._keys(query, source, source_id)
+        await self._fetch(keys)
+        info = None
+        for key in keys:
+            info = self.cache.get(key)
+            if info:
+                break
+        if info:
+            self.hits += 1
+            track_info.remember(info)
+        else:
+            self.misses += 1
+            info = await track_info.get(query)
+            if not info:
+                return None
+        for key in keys:
+            if not self.cache.get(key):
+                self.cache.set(key, info)
+                try:
+                    await save_track_match(key[0], key[1], info)
+                except Exception as e:
+                    LOGGER(__name__).warning(f"Failed to save track match: {e}")
+        return info
+
+    async def track(self, query: str, source: str = None, source_id: str = None):
+        """track_details and vidid for a source track, in the form the play flow expects."""
+        info = await self.resolve(query, source, source_id)
+        if not info:
+            raise ValueError(f"No results found for {query}")
+        track_details = {
+            "title": info["title"],
+            "link": info["link"],
+            "vidid": info["id"],
+            "duration_min": info["duration"],
+            "thumb": info["thumbnail"],
+        }
+        return track_details, info["id"]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits * 100 / lookups, 2) if lookups else 0,
+        }
+
+
+track_matches = TrackMatchIndex()
@@ -0,0 +1,70 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    In-memory mapping whose entries expire after ttl seconds, holding at
+    most maxsize entries and dropping the least recently used first.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        entry = self.data.get(key)
+        return entry is not None and entry[0] > time.time()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key, default=None):
+        entry = self.data.get(key)
+        if entry is not None and entry[0] > time.time():
+            self.data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self.data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: float = None):
+        self.data[key] = (time.time() + (ttl or self.ttl), value)
+        self.data.move_to_end(key)
+        while len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self.data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self.data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits * 100 / lookups, 2) if lookups else 0,
+        }
+
+
+async def cached_call(cache: TTLCache, flights, key, func, *args):
+    """
+    Returns the cached result for key, otherwise awaits func(*args) once
+    through the SingleFlight flights and caches a truthy result.
+    """
+    result = cache.get(key)
+    if result is None:
+        result = await flights.do(key, func, *args)
+        if result:
+            cache.set(key, result)
+    return result
@@ -0,0 +1,137 @@
+import os
+import threading
+
+from yt_dlp import YoutubeDL
+
+# These functions run inside the worker processes, keep them free of any
+# client or event loop state.
+
+# YoutubeDL instances of this worker process, kept between jobs so the
+# extractors and cookie jars are only set up once
+_instances = {}
+# The same for the bot process threads listing playlists, one set per thread
+# as an instance must not be shared between threads
+_listers = threading.local()
+
+FORMATS = {
+    "audio": "bestaudio[ext=webm]/bestaudio[ext=m4a]/bestaudio",
+    "video": "bestvideo[height<=?720][width<=?1280]+bestaudio/best[height<=?720][width<=?1280]",
+}
+
+
+def _ydl(cookie_file: str = None, **opts) -> YoutubeDL:
+    key = (cookie_file, tuple(sorted(opts.items())))
+    ydl = _instances.get(key)
+    if ydl is None:
+        params = {"quiet": True, "no_warnings": True, **opts}
+        if cookie_file:
+            params["cookiefile"] = cookie_file
+        ydl = _instances[key] = YoutubeDL(params)
+    return ydl
+
+
+def iter_playlist(link: str, limit: int, cookie_file: str = None):
+    """
+    Yields the video ids of a playlist while yt-dlp is still paging through
+    it. Runs on a thread of the bot process, which keeps its own YoutubeDL.
+    """
+    instances = _listers.__dict__
+    ydl = instances.get(cookie_file)
+    if ydl is None:
+        params = {
+            "quiet": True,
+            "no_warnings": True,
+            "extract_flat": "in_playlist",
+            "ignoreerrors": True,
+        }
+        if cookie_file:
+            params["cookiefile"] = cookie_file
+        ydl = instances[cookie_file] = YoutubeDL(params)
+    info = ydl.extract_info(link, download=False, process=False) or {}
+    if info.get("_type") in ("url", "url_transparent"):
+        info = ydl.extract_info(info["url"], download=False, process=False) or {}
+    count = 0
+    for entry in info.get("entries") or []:
+        if count >= limit:
+            break
+        if entry and entry.get("id"):
+            count += 1
+            yield entry["id"]
+
+
+def formats(link: str, cookie_file: str = None) -> list:
+    """The non-DASH formats of a video as plain dicts."""
+    info = _ydl(cookie_file).extract_info(link, download=False)
+    formats_available = []
+    for format in info["formats"]:
+        try:
+            if "dash" not in str(format["format"]).lower():
+                formats_available.append(
+                    {
+                        "format": format["format"],
+                        "filesize": format.get("filesize"),
+                        "format_id": format["format_id"],
+                        "ext": format["ext"],
+                        "format_note": format["format_note"],
+                        "yturl": link,
+                    }
+                )
+        except:
+            continue
+    return formats_available
+
+
+def format_sizes(link: str, cookie_file: str = None) -> list:
+    """The known file sizes of every format of a video."""
+    info = _ydl(cookie_file).extract_info(link, download=False)
+    return [format["filesize"] for format in info.get("formats", []) if format.get("filesize")]
+
+
+def download(link: str, media_type: str, file_path: str, cookie_file: str = None):
+    """
+    Downloads link with yt-dlp next to file_path and moves the finished file
+    onto file_path. Audio only formats are picked for audio. Returns the
+    size in bytes of the file.
+    """
+    directory, name = os.path.split(file_path)
+    opts = {
+        "format": FORMATS[media_type],
+        "outtmpl": os.path.join(directory, f"{os.path.splitext(name)[0]}.ytdlp.%(ext)s"),
+        "geo_bypass": True,
+        "nocheckcertificate": True,
+        "quiet": True,
+        "no_warnings": True,
+        "noplaylist": True,
+        "retries": 3,
+    }
+    if media_type == "video":
+        opts["merge_output_format"] = "mkv"
+    if cookie_file:
+        opts["cookiefile"] = cookie_file
+    with YoutubeDL(opts) as ydl:
+        info = ydl.extract_info(link, download=True)
+        output = ydl.prepare_filename(info)
+        if media_type == "video":
+            output = f"{os.path.splitext(output)[0]}.mkv"
+    os.replace(output, file_path)
+    return os.path.getsize(file_path)
+
+
+def extract(link: str, opts: dict) -> dict:
+    """The fields of link's info needed to name, size and describe the download."""
+    with YoutubeDL({**opts, "quiet": True, "no_warnings": True}) as ydl:
+        info = ydl.extract_info(link, download=False)
+    return {
+        "id": info["id"],
+        "ext": info["ext"],
+        "title": info.get("title"),
+        "duration": info.get("duration") or 0,
+        "uploader": info.get("uploader"),
+        "filesize": info.get("filesize") or info.get("filesize_approx"),
+    }
+
+
+def fetch(link: str, opts: dict):
+    """Downloads link with the given options, yt-dlp names the file from outtmpl."""
+    with YoutubeDL({**opts, "quiet": True, "no_warnings": True}) as ydl:
+        ydl.download([link])
@@ -49,10 +49,17 @@ AUTO_LEAVING_ASSISTANT = bool(getenv("AUTO_LEAVING_ASSISTANT", False))
 # Get this credentials from https://developer.spotify.com/dashboard
 SPOTIFY_CLIENT_ID = getenv("SPOTIFY_CLIENT_ID", None)
 SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", None)
+# Seconds resolved Spotify tracks, playlists, albums and artists are remembered.
+SPOTIFY_CACHE_TTL = int(getenv("SPOTIFY_CACHE_TTL", 3600))
+# Seconds scraped Apple Music and Resso pages are remembered, and how many are fetched at once per platform.
+SCRAPE_CACHE_TTL = int(getenv("SCRAPE_CACHE_TTL", 3600))
+SCRAPE_CONCURRENCY = int(getenv("SCRAPE_CONCURRENCY", 4))
 
 
 # Maximum limit for fetching playlist's track from youtube, spotify, apple links.
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
+# How many playlist tracks are looked up at once while the first ones start playing.
+PLAYLIST_RESOLVE_CONCURRENCY = int(getenv("PLAYLIST_RESOLVE_CONCURRENCY", 5))
 
 
 # Telegram audio and video file size limit (in bytes)
@@ -61,6 +68,60 @@ TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 1073741824))
 # Checkout https://www.gbmb.org/mb-to-bytes for converting mb to bytes
 
 
+# Download API base urls separated by spaces, more are loaded from API_URL_SOURCE every API_URL_TTL seconds.
+API_URLS = getenv("API_URLS", "").split()
+API_URL_SOURCE = getenv("API_URL_SOURCE", "https://pastebin.com/raw/rLsBhAQa")
+API_URL_TTL = int(getenv("API_URL_TTL", 3600))
+# Per call timeout and retry rounds for the download API (in seconds), a duplicate call goes to the next endpoint after HEDGE_DELAY until enough latencies are known.
+API_TIMEOUT = int(getenv("API_TIMEOUT", 20))
+API_RETRIES = int(getenv("API_RETRIES", 2))
+HEDGE_DELAY = float(getenv("HEDGE_DELAY", 3))
+# An endpoint is skipped after BREAKER_THRESHOLD failures in a row and tried again after BREAKER_RESET_TIMEOUT seconds.
+BREAKER_THRESHOLD = int(getenv("BREAKER_THRESHOLD", 3))
+BREAKER_RESET_TIMEOUT = int(getenv("BREAKER_RESET_TIMEOUT", 60))
+
+
+# Disk budget (in bytes) for downloaded tracks kept in the downloads folder for replays.
+CACHE_SIZE_LIMIT = int(getenv("CACHE_SIZE_LIMIT", 5368709120))
+# Which cached track is dropped first when the budget is full, "lru" or "lfu".
+CACHE_EVICTION_POLICY = getenv("CACHE_EVICTION_POLICY", "lru").lower()
+
+# How many upcoming queued tracks per chat are downloaded in the background, and how many such downloads may run at once.
+PREFETCH_AHEAD = int(getenv("PREFETCH_AHEAD", 2))
+PREFETCH_CONCURRENCY = int(getenv("PREFETCH_CONCURRENCY", 3))
+
+# Set this to True to start playback from the API stream url while the track is still being downloaded into the cache.
+STREAM_WHILE_DOWNLOAD = bool(getenv("STREAM_WHILE_DOWNLOAD", False))
+
+# Shared HTTP connection pool: total and per host connection limits, idle keep-alive and DNS cache lifetime (in seconds).
+HTTP_POOL_LIMIT = int(getenv("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST = int(getenv("HTTP_POOL_LIMIT_PER_HOST", 10))
+HTTP_KEEPALIVE = int(getenv("HTTP_KEEPALIVE", 30))
+HTTP_DNS_CACHE_TTL = int(getenv("HTTP_DNS_CACHE_TTL", 300))
+# Default request timeouts (in seconds), downloads pass their own longer limits.
+HTTP_TIMEOUT = int(getenv("HTTP_TIMEOUT", 60))
+HTTP_CONNECT_TIMEOUT = int(getenv("HTTP_CONNECT_TIMEOUT", 10))
+
+# Number of worker processes for short blocking work like thumbnails and yt-dlp lookups, and for local yt-dlp downloads.
+WORKER_PROCESSES = int(getenv("WORKER_PROCESSES", 2))
+DOWNLOAD_PROCESSES = int(getenv("DOWNLOAD_PROCESSES", 2))
+
+# Now playing cards are saved as "jpeg" or "webp" with this quality.
+THUMB_FORMAT = getenv("THUMB_FORMAT", "jpeg").lower()
+THUMB_QUALITY = int(getenv("THUMB_QUALITY", 85))
+# How many rendered playlist summary cards are kept in cache/carbon.
+CARBON_CACHE_SIZE = int(getenv("CARBON_CACHE_SIZE", 100))
+
+# YouTube track metadata kept in memory (entries and seconds), set TRACKINFO_MONGO to True to also keep it in Mongo for TRACKINFO_MONGO_TTL seconds.
+TRACKINFO_CACHE_SIZE = int(getenv("TRACKINFO_CACHE_SIZE", 2000))
+TRACKINFO_CACHE_TTL = int(getenv("TRACKINFO_CACHE_TTL", 21600))
+TRACKINFO_MONGO = bool(getenv("TRACKINFO_MONGO", False))
+TRACKINFO_MONGO_TTL = int(getenv("TRACKINFO_MONGO_TTL", 604800))
+# Search result pages kept for the /play slider (entries and seconds).
+SEARCH_CACHE_SIZE = int(getenv("SEARCH_CACHE_SIZE", 500))
+SEARCH_CACHE_TTL = int(getenv("SEARCH_CACHE_TTL", 900))
+
+
 # Get your pyrogram v2 session from @StringFatherBot on Telegram
 STRING1 = getenv("STRING_SESSION", None)
 STRING2 = getenv("STRING_SESSION2", None)